@@ -1,28 +1,24 @@
-import pandas as pd
 import matplotlib.pyplot as plt
+import numpy as np
+from analytics import analyze
+from plotting import downsample
 
-# Read the CSV file using the semicolon as the delimiter
-df = pd.read_csv("TutorialData.csv", delimiter=";")
+# Statistics for every product in one pass; cached on disk, so re-runs are instant
+kelp = analyze("TutorialData.csv")['KELP']
 
-# Filter for KELP
-kelp_df = df[df['product'] == 'KELP'].copy()
+# Differenced series of mid_price, without the leading NaN
+mid_price_diff = kelp['mid_diff'][1:]
 
-# Compute the differenced series of mid_price
-kelp_df["mid_price_diff"] = kelp_df["mid_price"].diff()
-
-# Drop the first NaN caused by the diff()
-kelp_df.dropna(subset=["mid_price_diff"], inplace=True)
-
-# Create a figure with 2 subplots
+# Create a figure with 2 subplots; lines are downsampled to ~2 points per pixel of its 1000px width
 fig, axes = plt.subplots(nrows=2, ncols=1, figsize=(10, 6), sharex=True)
 
 # --- Top Subplot: Differenced Mid Price ---
-axes[0].plot(kelp_df["mid_price_diff"].reset_index(drop=True))
+axes[0].plot(*downsample(np.arange(len(mid_price_diff)), mid_price_diff, 1000))
 axes[0].set_title("KELP - Differenced Mid Price")
 axes[0].set_ylabel("Difference")
 
 # --- Bottom Subplot: Actual Mid Price Over Time ---
-axes[1].plot(kelp_df["mid_price"].reset_index(drop=True))
+axes[1].plot(*downsample(np.arange(len(kelp['mid_price'])), kelp['mid_price'], 1000))
 axes[1].set_title("KELP - Actual Mid Price")
 axes[1].set_xlabel("Time")
 axes[1].set_ylabel("Mid Price")
@@ -0,0 +1,189 @@
+import argparse
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from tickstore import open_store
+
+# Per-product market statistics for every product in a prices CSV, computed in one pass over
+# the tick store and cached on disk under a key derived from the CSV's contents.
+#
+# Arrays (one value per row of the product):
+#   mid_price, mid_diff, spread, sma_<w> for each window
+# Summary (JSON-friendly):
+#   crossovers "<short>_<long>" -> row indices where the two SMAs cross
+#   spread / bid_volume_1 / ask_volume_1 / depth distribution stats, spread value counts,
+#   autocorrelation of mid_diff at lags 1..max_lag
+
+DEFAULT_WINDOWS = (5, 10, 30, 100)
+DEFAULT_MAX_LAG = 20
+VERSION = 1
+
+
+class ProductStats:
+
+    def __init__(self, product: str, arrays: Dict[str, np.ndarray], summary: Dict[str, Any]) -> None:
+        self.product = product
+        self.arrays = arrays
+        self.summary = summary
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def crossovers(self, short: int, long: int) -> List[int]:
+        return self.summary["crossovers"][f"{short}_{long}"]
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """pandas' rolling(window).mean(): NaN until the window is full."""
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        result[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return result
+
+
+def crossover_rows(short_sma: np.ndarray, long_sma: np.ndarray, long_window: int) -> List[int]:
+    # Same rule as the old vis.py: a change of sign of (short - long) once both are defined
+    diff = (short_sma - long_sma)[long_window - 1:]
+    return (np.where(np.diff(np.sign(diff)) != 0)[0] + 1 + long_window - 1).tolist()
+
+
+def describe(values: np.ndarray) -> Dict[str, float]:
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"count": 0}
+    q25, q50, q75 = np.percentile(values, [25, 50, 75])
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "min": float(values.min()),
+        "25%": float(q25),
+        "50%": float(q50),
+        "75%": float(q75),
+        "max": float(values.max()),
+    }
+
+
+def value_counts(values: np.ndarray, top: int = 10) -> List[List[float]]:
+    values = values[~np.isnan(values)]
+    unique, counts = np.unique(values, return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [[float(unique[i]), int(counts[i])] for i in order]
+
+
+def autocorrelation(values: np.ndarray, max_lag: int) -> List[float]:
+    values = values[~np.isnan(values)]
+    centered = values - values.mean() if len(values) else values
+    variance = float(np.dot(centered, centered))
+    if variance == 0:
+        return [0.0] * max_lag
+    return [float(np.dot(centered[:-lag], centered[lag:]) / variance) for lag in range(1, min(max_lag, len(values) - 1) + 1)]
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(values)
+    return values[np.maximum.accumulate(np.where(valid, np.arange(len(values)), 0))]
+
+
+def analyze_product(product: str, columns: Dict[str, np.ndarray], windows: Iterable[int], max_lag: int) -> ProductStats:
+    windows = sorted(windows)
+    mid = forward_fill(np.asarray(columns["mid_price"], dtype=np.float64))
+    spread = np.asarray(columns["ask_price_1"]) - np.asarray(columns["bid_price_1"])
+    mid_diff = np.concatenate(([np.nan], np.diff(mid)))
+
+    arrays = {"mid_price": mid, "mid_diff": mid_diff, "spread": spread}
+    for window in windows:
+        arrays[f"sma_{window}"] = rolling_mean(mid, window)
+
+    crossovers = {}
+    for i, short in enumerate(windows):
+        for long in windows[i + 1:]:
+            crossovers[f"{short}_{long}"] = crossover_rows(arrays[f"sma_{short}"], arrays[f"sma_{long}"], long)
+
+    depth = np.zeros(len(mid))
+    for side in ("bid", "ask"):
+        for level in (1, 2, 3):
+            depth += np.nan_to_num(np.asarray(columns[f"{side}_volume_{level}"]))
+
+    summary = {
+        "rows": int(len(mid)),
+        "mid_price": describe(mid),
+        "bid_price_1": describe(np.asarray(columns["bid_price_1"])),
+        "ask_price_1": describe(np.asarray(columns["ask_price_1"])),
+        "spread": describe(spread),
+        "spread_counts": value_counts(spread),
+        "bid_volume_1": describe(np.asarray(columns["bid_volume_1"])),
+        "ask_volume_1": describe(np.asarray(columns["ask_volume_1"])),
+        "depth": describe(depth),
+        "mid_diff": describe(mid_diff),
+        "mid_diff_autocorrelation": autocorrelation(mid_diff, max_lag),
+        "crossovers": crossovers,
+    }
+    return ProductStats(product, arrays, summary)
+
+
+def cache_path(csv_path: str, key: str) -> str:
+    return os.path.join(os.path.splitext(csv_path)[0] + ".analytics", key)
+
+
+def analyze(csv_path: str, windows: Iterable[int] = DEFAULT_WINDOWS, max_lag: int = DEFAULT_MAX_LAG, use_cache: bool = True) -> Dict[str, ProductStats]:
+    """Statistics for every product in ``csv_path``. A repeat call with the same file contents
+    and arguments loads <csv name>.analytics/<key>.npz/.json instead of recomputing."""
+    windows = tuple(sorted(windows))
+    key = hashlib.sha256(json.dumps([VERSION, file_hash(csv_path), windows, max_lag]).encode()).hexdigest()[:24]
+    path = cache_path(csv_path, key)
+
+    if use_cache and os.path.exists(path + ".json"):
+        with open(path + ".json") as f:
+            summaries = json.load(f)
+        with np.load(path + ".npz") as arrays:
+            return {
+                product: ProductStats(product, {name.split("/", 1)[1]: arrays[name] for name in arrays.files if name.startswith(product + "/")}, summary)
+                for product, summary in summaries.items()
+            }
+
+    store = open_store(csv_path)
+    results = {product: analyze_product(product, store.product(product), windows, max_lag) for product in store.products}
+
+    if use_cache:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path + ".npz", **{f"{product}/{name}": array for product, stats in results.items() for name, array in stats.arrays.items()})
+        # The summary is written last and is what marks the entry as complete
+        with open(path + ".json", "w") as f:
+            json.dump({product: stats.summary for product, stats in results.items()}, f)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-product market statistics for a prices CSV.")
+    parser.add_argument("prices", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--windows", default=",".join(map(str, DEFAULT_WINDOWS)))
+    parser.add_argument("--max-lag", type=int, default=DEFAULT_MAX_LAG)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    results = analyze(args.prices, [int(w) for w in args.windows.split(",")], args.max_lag, not args.no_cache)
+    for product, stats in results.items():
+        summary = stats.summary
+        print(f"== {product} ({summary['rows']} rows)")
+        print(f"mid   {summary['mid_price']}")
+        print(f"spread {summary['spread']}")
+        print(f"spread counts {summary['spread_counts']}")
+        print(f"depth {summary['depth']}")
+        print(f"mid_diff autocorrelation (lags 1-5) {[round(x, 3) for x in summary['mid_diff_autocorrelation'][:5]]}")
+        for pair, rows in summary["crossovers"].items():
+            print(f"SMA {pair} crossovers: {len(rows)}")
@@ -0,0 +1,332 @@
+import argparse
+import contextlib
+import csv
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from compactmodel import Listing, Trade, TradingState
+from datamodel import Observation, Order, OrderDepth, Product, Symbol
+from matching import POSITION_LIMIT, SUBMISSION, MatchingEngine, match_market_trades
+from profiling import DEFAULT_BUDGET_MS, Profiler, instrument_trader
+
+DENOMINATION = "SEASHELLS"
+
+
+class Snapshot:
+    """Everything the exchange knows about one (day, timestamp)."""
+
+    def __init__(self, day: int, timestamp: int, order_depths: Dict[Symbol, OrderDepth], mid_prices: Dict[Symbol, float], market_trades: Optional[Dict[Symbol, List[Trade]]] = None) -> None:
+        self.day = day
+        self.timestamp = timestamp
+        self.order_depths = order_depths
+        self.mid_prices = mid_prices
+        self.market_trades = market_trades if market_trades is not None else {}
+        self._listings: Optional[Dict[Symbol, Listing]] = None
+
+    @property
+    def listings(self) -> Dict[Symbol, Listing]:
+        # Built on first use and shared by every strategy stepped through this snapshot
+        if self._listings is None:
+            self._listings = {symbol: Listing(symbol, symbol, DENOMINATION) for symbol in self.order_depths}
+        return self._listings
+
+
+def order_depth_from_levels(levels: Sequence[Any]) -> OrderDepth:
+    """OrderDepth from the twelve level values of a prices row, already numeric and in file
+    order (bid_price_1, bid_volume_1, ..., ask_price_3, ask_volume_3); a missing level has a
+    None or NaN price. Bids are inserted best (highest) first and asks best (lowest) first, with
+    negative ask volumes, like the exchange does."""
+    order_depth = OrderDepth()
+    for i in (0, 2, 4):
+        price = levels[i]
+        if price is not None and price == price:
+            order_depth.buy_orders[int(price)] = int(levels[i + 1])
+    for i in (6, 8, 10):
+        price = levels[i]
+        if price is not None and price == price:
+            order_depth.sell_orders[int(price)] = -int(levels[i + 1])
+
+    return order_depth
+
+
+def parse_order_depth(row: List[str], first_column: int = 3) -> OrderDepth:
+    # Columns are bid_price_1;bid_volume_1;...;ask_volume_3 as strings, missing levels are empty
+    return order_depth_from_levels([float(value) if value else None for value in row[first_column : first_column + 12]])
+
+
+def read_snapshots(path: str, delimiter: str = ";") -> Iterator[Snapshot]:
+    """Stream a prices CSV, yielding one Snapshot per (day, timestamp) without loading the whole file."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        next(reader)  # header
+
+        snapshot = None
+        for row in reader:
+            if not row:
+                continue
+            day = int(row[0])
+            timestamp = int(row[1])
+            if snapshot is None or snapshot.timestamp != timestamp or snapshot.day != day:
+                if snapshot is not None:
+                    yield snapshot
+                snapshot = Snapshot(day, timestamp, {}, {})
+
+            product = row[2]
+            snapshot.order_depths[product] = parse_order_depth(row)
+            if row[15]:
+                snapshot.mid_prices[product] = float(row[15])
+
+        if snapshot is not None:
+            yield snapshot
+
+
+class Account:
+    """Per-strategy bookkeeping carried between ticks: traderData, positions, cash, last fills
+    and the unfilled remainders of last tick's orders."""
+
+    def __init__(self) -> None:
+        self.trader_data = ""
+        self.position: Dict[Product, int] = {}
+        self.cash: Dict[Product, float] = {}
+        self.own_trades: Dict[Symbol, List[Trade]] = {}
+        self.last_mid: Dict[Product, float] = {}
+        self.pending: Dict[Symbol, List[Order]] = {}
+
+    def apply(self, trade: Trade) -> None:
+        if trade.buyer == SUBMISSION:
+            self.position[trade.symbol] = self.position.get(trade.symbol, 0) + trade.quantity
+            self.cash[trade.symbol] = self.cash.get(trade.symbol, 0.0) - trade.price * trade.quantity
+        else:
+            self.position[trade.symbol] = self.position.get(trade.symbol, 0) - trade.quantity
+            self.cash[trade.symbol] = self.cash.get(trade.symbol, 0.0) + trade.price * trade.quantity
+
+    def mark(self, mid_prices: Dict[Symbol, float]) -> None:
+        self.last_mid.update(mid_prices)
+
+    def pnl(self) -> Dict[Product, float]:
+        products = set(self.cash) | set(self.position)
+        return {
+            product: self.cash.get(product, 0.0) + self.position.get(product, 0) * self.last_mid.get(product, 0.0)
+            for product in products
+        }
+
+
+class BacktestResult:
+
+    def __init__(self) -> None:
+        self.pnl: Dict[Product, float] = {}
+        self.pnl_history: List[float] = []
+        self.fill_count = 0
+        self.tick_count = 0
+        self.days: List[int] = []
+
+    @property
+    def total_pnl(self) -> float:
+        return sum(self.pnl.values())
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough fall of total PnL over the replay."""
+        peak = 0.0
+        drawdown = 0.0
+        for pnl in self.pnl_history:
+            if pnl > peak:
+                peak = pnl
+            elif peak - pnl > drawdown:
+                drawdown = peak - pnl
+        return drawdown
+
+    def summary(self) -> str:
+        lines = [f"days={self.days} ticks={self.tick_count} fills={self.fill_count}"]
+        for product in sorted(self.pnl):
+            lines.append(f"{product}: {self.pnl[product]:.2f}")
+        lines.append(f"Total: {self.total_pnl:.2f}")
+        lines.append(f"Max drawdown: {self.max_drawdown:.2f}")
+        return "\n".join(lines)
+
+
+class _NullWriter:
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def flush(self) -> None:
+        pass
+
+
+class Backtester:
+    """Replays snapshots through ``trader.run``, feeding traderData back in on the next tick.
+
+    Every day starts flat with empty traderData, as on the exchange; PnL adds up across days.
+    """
+
+    def __init__(self, trader, position_limit: int = POSITION_LIMIT, quiet: bool = True, profiler: Optional[Profiler] = None) -> None:
+        self.trader = trader
+        self.position_limit = position_limit
+        self.quiet = quiet
+        # Times every run call from outside the trader
+        self.profiler = profiler
+
+    def run(self, snapshots: Iterable[Snapshot]) -> BacktestResult:
+        return run_lockstep([self], snapshots)[0]
+
+    def step(self, account: Account, snapshot: Snapshot) -> int:
+        """Run one tick for one account and return the number of fills."""
+        own_trades: Dict[Symbol, List[Trade]] = {}
+        fills = 0
+
+        # Whatever did not fill against the book last tick can still trade against the market
+        # trades that printed since then
+        for symbol, remaining in account.pending.items():
+            trades = match_market_trades(remaining, snapshot.market_trades.get(symbol, []), snapshot.timestamp)
+            for trade in trades:
+                account.apply(trade)
+            if trades:
+                own_trades[symbol] = trades
+                fills += len(trades)
+        if own_trades:
+            for symbol, trades in account.own_trades.items():
+                own_trades[symbol] = trades + own_trades.get(symbol, [])
+            account.own_trades = own_trades
+            own_trades = {}
+
+        state = TradingState(
+            account.trader_data,
+            snapshot.timestamp,
+            snapshot.listings,
+            snapshot.order_depths,
+            account.own_trades,
+            snapshot.market_trades,
+            dict(account.position),
+            Observation({}, {}),
+        )
+        if self.profiler is not None:
+            self.profiler.begin_tick()
+            orders, conversions, trader_data = self.trader.run(state)
+            self.profiler.end_tick(snapshot.timestamp)
+        else:
+            orders, conversions, trader_data = self.trader.run(state)
+        account.trader_data = trader_data if trader_data is not None else ""
+
+        pending: Dict[Symbol, List[Order]] = {}
+        for symbol, symbol_orders in orders.items():
+            if not symbol_orders or symbol not in snapshot.order_depths:
+                continue
+            engine = MatchingEngine.from_order_depth(symbol, snapshot.order_depths[symbol], self.position_limit)
+            trades, remaining = engine.submit(symbol_orders, account.position.get(symbol, 0), snapshot.timestamp)
+            for trade in trades:
+                account.apply(trade)
+            if trades:
+                own_trades[symbol] = trades
+                fills += len(trades)
+            if remaining:
+                pending[symbol] = remaining
+
+        account.own_trades = own_trades
+        account.pending = pending
+        account.mark(snapshot.mid_prices)
+        return fills
+
+
+class Session:
+    """One strategy's progress through a replay: its account, per-day PnL carry and result."""
+
+    def __init__(self, backtester: Backtester) -> None:
+        self.backtester = backtester
+        self.account = Account()
+        self.result = BacktestResult()
+        self.day: Optional[int] = None
+        self.day_offset: Dict[Product, float] = {}
+
+    def step(self, snapshot: Snapshot) -> None:
+        if snapshot.day != self.day:
+            if self.day is not None:
+                for product, pnl in self.account.pnl().items():
+                    self.day_offset[product] = self.day_offset.get(product, 0.0) + pnl
+                self.account = Account()
+            self.day = snapshot.day
+            self.result.days.append(self.day)
+
+        self.result.fill_count += self.backtester.step(self.account, snapshot)
+        self.result.tick_count += 1
+        self.result.pnl_history.append(sum(self.day_offset.values()) + sum(self.account.pnl().values()))
+
+    def finish(self) -> BacktestResult:
+        result = self.result
+        for product, pnl in self.account.pnl().items():
+            result.pnl[product] = self.day_offset.get(product, 0.0) + pnl
+        for product, pnl in self.day_offset.items():
+            result.pnl.setdefault(product, pnl)
+        return result
+
+
+def run_lockstep(backtesters: List[Backtester], snapshots: Iterable[Snapshot]) -> List[BacktestResult]:
+    """Replay one snapshot stream through several backtesters at once.
+
+    Each snapshot is read and built once and then stepped through every strategy in turn; each
+    strategy keeps its own account (traderData, positions, fills). Order depths and market
+    trades are shared, so traders must treat them as read-only. Results are in the order of
+    ``backtesters``. Stdout is discarded only if every backtester is quiet.
+    """
+    return replay([Session(backtester) for backtester in backtesters], snapshots)
+
+
+def replay(sessions: List[Session], snapshots: Iterable[Snapshot], after_step: Optional[Callable[[Snapshot], None]] = None) -> List[BacktestResult]:
+    """run_lockstep for sessions that may already be part way through (see checkpoint.py).
+    ``after_step`` is called with each snapshot once every session has stepped it."""
+    backtesters = [session.backtester for session in sessions]
+
+    # Output is discarded anyway, so let module-level Loggers skip building it
+    silenced = []
+    for backtester in backtesters:
+        logger = getattr(sys.modules.get(type(backtester.trader).__module__), "logger", None)
+        if backtester.quiet and getattr(logger, "enabled", None) is not None and all(logger is not other for other, _ in silenced):
+            silenced.append((logger, logger.enabled))
+            logger.enabled = False
+
+    quiet = all(backtester.quiet for backtester in backtesters)
+    try:
+        with contextlib.redirect_stdout(_NullWriter()) if quiet else contextlib.nullcontext():
+            for snapshot in snapshots:
+                for session in sessions:
+                    session.step(snapshot)
+                if after_step is not None:
+                    after_step(snapshot)
+    finally:
+        for logger, enabled in silenced:
+            logger.enabled = enabled
+
+    return [session.finish() for session in sessions]
+
+
+def load_trader(module_name: str):
+    return importlib.import_module(module_name).Trader()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a prices CSV through a Trader.run implementation.")
+    parser.add_argument("trader", help="module containing a Trader class, e.g. fairpriceMean2")
+    parser.add_argument("prices", nargs="*", default=["TutorialData.csv"], help="one or more prices files, in day order")
+    parser.add_argument("--trades", action="append", default=[], help="market trades file (repeatable)")
+    parser.add_argument("--limit", type=int, default=POSITION_LIMIT)
+    parser.add_argument("--verbose", action="store_true", help="let the trader's stdout through")
+    parser.add_argument("--profile", action="store_true", help="report per-tick and per-section latency")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="warn about ticks slower than this")
+    args = parser.parse_args()
+
+    trader = load_trader(args.trader)
+    profiler = None
+    if args.profile:
+        profiler = Profiler(enabled=True, budget_ms=args.budget_ms)
+        instrument_trader(profiler, trader)
+
+    backtester = Backtester(trader, args.limit, quiet=not args.verbose, profiler=profiler)
+    if len(args.prices) == 1 and not args.trades:
+        snapshots = read_snapshots(args.prices[0])
+    else:
+        from marketdata import iter_snapshots
+
+        snapshots = iter_snapshots(args.prices, args.trades)
+    print(backtester.run(snapshots).summary())
+    if profiler is not None:
+        print(profiler.report())
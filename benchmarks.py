@@ -0,0 +1,175 @@
+import argparse
+import contextlib
+import json
+import platform
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+import compactmodel
+import datamodel
+import fairpriceMean
+import fairpriceMean2
+from backtester import _NullWriter
+from datamodel import Listing, Observation, Order, OrderDepth, Trade, TradingState
+from traderdata import codec
+
+# Micro-benchmarks for the strategy hot path on synthetic TradingStates of growing size.
+#
+#   python benchmarks.py run --out before.json
+#   python benchmarks.py run --out after.json
+#   python benchmarks.py compare before.json after.json --threshold 0.10
+
+FAIR_PRICES = {"KELP": 2019, "RAINFOREST_RESIN": 10000}
+
+# (book depth, market trades per product, values of history in traderData). Sizes grow the
+# KELP and RAINFOREST_RESIN books rather than adding products the traders would skip.
+SIZES = {
+    "small": (3, 0, 0),
+    "medium": (10, 50, 500),
+    "large": (50, 500, 5000),
+}
+
+
+def make_state(depth: int, trades: int, history: int, timestamp: int = 100) -> TradingState:
+    order_depths = {}
+    market_trades = {}
+    for product, fair in FAIR_PRICES.items():
+        order_depth = OrderDepth()
+        for level in range(depth):
+            order_depth.buy_orders[fair - 2 - level] = 5 + level
+        for level in range(depth):
+            order_depth.sell_orders[fair + 2 + level] = -(5 + level)
+        order_depths[product] = order_depth
+        market_trades[product] = [Trade(product, fair + (i % 5) - 2, 1 + i % 7, "A", "B", timestamp - 100) for i in range(trades)]
+
+    trader_object = {"history": [FAIR_PRICES["KELP"] + (i % 13) * 0.5 for i in range(history)]}
+    return TradingState(
+        codec.encode(trader_object),
+        timestamp,
+        {product: Listing(product, product, "SEASHELLS") for product in FAIR_PRICES},
+        order_depths,
+        {},
+        market_trades,
+        {product: (i * 7) % 41 - 20 for i, product in enumerate(FAIR_PRICES)},
+        Observation({}, {}),
+    )
+
+
+def cases() -> List[Tuple[str, Callable[[], Any]]]:
+    result = []
+    for size, (depth, trades, history) in SIZES.items():
+        state = make_state(depth, trades, history)
+
+        trader = fairpriceMean.Trader()
+        result.append((f"fairpriceMean.run/{size}", lambda trader=trader, state=state: trader.run(state)))
+
+        trader2 = fairpriceMean2.Trader()
+        result.append((f"fairpriceMean2.run/{size}", lambda trader=trader2, state=state: trader.run(state)))
+
+        orders = {product: [Order(product, fair, 5), Order(product, fair + 1, -5)] for product, fair in FAIR_PRICES.items()}
+        logger = fairpriceMean.Logger()
+
+        def flush(logger=logger, state=state, orders=orders):
+            logger.logs = "BUY 15x 9996\n" * 20
+            logger.flush(state, orders, 1, state.traderData)
+
+        result.append((f"Logger.flush/{size}", flush))
+
+    order_depth = make_state(3, 0, 0).order_depths["KELP"]
+    for window in (5, 100):
+        trader = fairpriceMean.Trader()
+        trader_object: Dict[str, Any] = {}
+        for _ in range(window):
+            trader.computeMA(order_depth, window, trader_object)
+        result.append((f"computeMA/{window}", lambda trader=trader, window=window, trader_object=trader_object: trader.computeMA(order_depth, window, trader_object)))
+
+    for name, module in (("datamodel", datamodel), ("compactmodel", compactmodel)):
+        result.append((f"{name}.Order", lambda module=module: module.Order("KELP", 2019, 5)))
+        result.append((f"{name}.Trade", lambda module=module: module.Trade("KELP", 2019, 5, "A", "B", 100)))
+        result.append((f"{name}.TradingState", lambda module=module: module.TradingState("", 100, {}, {}, {}, {}, {}, None)))
+        json_state = module.TradingState("", 100, {}, {"KELP": OrderDepth()}, {"KELP": [module.Trade("KELP", 2019, 5, "A", "B", 100)]}, {}, {"KELP": 5}, None)
+        result.append((f"{name}.TradingState.toJSON", json_state.toJSON))
+    result.append(("datamodel.OrderDepth", OrderDepth))
+
+    return result
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> float:
+    """Best-of-``repeat`` time per call in microseconds."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def run(filter_text: str = "", repeat: int = 5, min_time: float = 0.05) -> Dict[str, Any]:
+    results = {}
+    with contextlib.redirect_stdout(_NullWriter()):
+        for name, fn in cases():
+            if filter_text in name:
+                results[name] = measure(fn, repeat, min_time)
+
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results_us": results,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Print old/new timings side by side and return the names that got slower than
+    ``threshold`` (a fraction, 0.10 = 10%)."""
+    regressions = []
+    old_results = old["results_us"]
+    new_results = new["results_us"]
+    print(f"{'benchmark':<32}{'old us':>12}{'new us':>12}{'change':>10}")
+    for name in sorted(set(old_results) | set(new_results)):
+        if name not in old_results or name not in new_results:
+            print(f"{name:<32}{old_results.get(name, float('nan')):>12.2f}{new_results.get(name, float('nan')):>12.2f}{'n/a':>10}")
+            continue
+        change = new_results[name] / old_results[name] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<32}{old_results[name]:>12.2f}{new_results[name]:>12.2f}{change:>+10.1%}{flag}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strategy hot-path micro-benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--out", default="bench_results.json")
+    run_parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    run_parser.add_argument("--repeat", type=int, default=5)
+
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        report = run(args.filter, args.repeat)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        for name, us in report["results_us"].items():
+            print(f"{name:<32}{us:>12.2f} us")
+    else:
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
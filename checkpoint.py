@@ -0,0 +1,147 @@
+import argparse
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backtester import Account, Backtester, BacktestResult, Session, Snapshot, replay
+from compactmodel import Order, Trade
+from lockstep import make_trader, parse_variant, side_by_side
+from tickstore import open_store
+from traderdata import TraderDataCodec
+
+# Checkpoints of a replay part way through, so late-session experiments need not start at 0.
+#
+# A checkpoint holds one strategy's whole replay state after a given (day, timestamp): the
+# account (traderData, positions, cash, last fills, unfilled orders, last mids), the PnL carried
+# from earlier days, the result so far and any log lines the trader's Logger has not flushed.
+# It is stored with the traderData codec (packed numeric lists, zlib). Restoring it into a
+# Backtester resumes the run; restoring it into a different Trader forks a variant from there.
+
+VERSION = 1
+
+_codec = TraderDataCodec(schema=VERSION)
+
+
+def _module_logger(trader):
+    return getattr(sys.modules.get(type(trader).__module__), "logger", None)
+
+
+class Checkpoint:
+
+    def __init__(self, day: int, timestamp: int, state: Dict[str, Any]) -> None:
+        self.day = day
+        self.timestamp = timestamp
+        self.state = state
+
+    @classmethod
+    def capture(cls, session: Session, snapshot: Snapshot) -> "Checkpoint":
+        account, result = session.account, session.result
+        logger = _module_logger(session.backtester.trader)
+        state = {
+            "trader_data": account.trader_data,
+            "position": dict(account.position),
+            "cash": dict(account.cash),
+            "last_mid": dict(account.last_mid),
+            "own_trades": {symbol: [[t.price, t.quantity, t.buyer, t.seller, t.timestamp] for t in trades] for symbol, trades in account.own_trades.items()},
+            "pending": {symbol: [[o.price, o.quantity] for o in orders] for symbol, orders in account.pending.items()},
+            "day_offset": dict(session.day_offset),
+            "pnl_history": list(result.pnl_history),
+            "fill_count": result.fill_count,
+            "tick_count": result.tick_count,
+            "days": list(result.days),
+            "logs": getattr(logger, "logs", ""),
+        }
+        return cls(snapshot.day, snapshot.timestamp, state)
+
+    def restore(self, backtester: Backtester) -> Session:
+        """A new Session for ``backtester`` positioned just after this checkpoint. Each call
+        gives an independent copy, so one checkpoint can be forked into many variants."""
+        state = _codec.decode(_codec.encode(self.state))
+        session = Session(backtester)
+        session.day = self.day
+        session.day_offset = state["day_offset"]
+
+        account = Account()
+        account.trader_data = state["trader_data"]
+        account.position = state["position"]
+        account.cash = state["cash"]
+        account.last_mid = state["last_mid"]
+        account.own_trades = {symbol: [Trade(symbol, *row) for row in rows] for symbol, rows in state["own_trades"].items()}
+        account.pending = {symbol: [Order(symbol, *row) for row in rows] for symbol, rows in state["pending"].items()}
+        session.account = account
+
+        result = BacktestResult()
+        result.pnl_history = state["pnl_history"]
+        result.fill_count = state["fill_count"]
+        result.tick_count = state["tick_count"]
+        result.days = state["days"]
+        session.result = result
+
+        logger = _module_logger(backtester.trader)
+        if logger is not None and hasattr(logger, "logs"):
+            logger.logs = state["logs"]
+        return session
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write(_codec.encode({"day": self.day, "timestamp": self.timestamp, "state": self.state}))
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with open(path) as f:
+            data = _codec.decode(f.read())
+        return cls(data["day"], data["timestamp"], data["state"])
+
+
+def run_with_checkpoints(backtester: Backtester, csv_path: str, at: Iterable[Tuple[Optional[int], int]], out_dir: str) -> Tuple[BacktestResult, List[str]]:
+    """Full replay of ``csv_path`` that saves a checkpoint after each (day, timestamp) in
+    ``at``; a day of None means that timestamp on every day."""
+    at = set(at)
+    os.makedirs(out_dir, exist_ok=True)
+    session = Session(backtester)
+    paths = []
+
+    def after_step(snapshot: Snapshot) -> None:
+        if (snapshot.day, snapshot.timestamp) in at or (None, snapshot.timestamp) in at:
+            path = os.path.join(out_dir, f"day{snapshot.day}_{snapshot.timestamp}.ckpt")
+            Checkpoint.capture(session, snapshot).save(path)
+            paths.append(path)
+
+    result = replay([session], open_store(csv_path).iter_snapshots(), after_step)[0]
+    return result, paths
+
+
+def resume(checkpoint: Checkpoint, backtesters: List[Backtester], csv_path: str) -> List[BacktestResult]:
+    """Continue from ``checkpoint`` once per backtester, in lockstep. The tick store seeks
+    straight to the checkpoint, so nothing before it is read."""
+    snapshots = open_store(csv_path).iter_snapshots(after=(checkpoint.day, checkpoint.timestamp))
+    return replay([checkpoint.restore(backtester) for backtester in backtesters], snapshots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save replay checkpoints and resume or fork variants from them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = commands.add_parser("save", help="replay a variant and checkpoint it at the given points")
+    save_parser.add_argument("variant", help='"module" or "module name=value ..."')
+    save_parser.add_argument("--prices", default="TutorialData.csv")
+    save_parser.add_argument("--at", action="append", type=int, required=True, metavar="TIMESTAMP", help="checkpoint after this timestamp (repeatable)")
+    save_parser.add_argument("--day", type=int, help="only on this day, e.g. --day -1 (default: every day)")
+    save_parser.add_argument("--out", default="checkpoints")
+
+    resume_parser = commands.add_parser("resume", help="continue one or more variants from a checkpoint")
+    resume_parser.add_argument("checkpoint")
+    resume_parser.add_argument("variants", nargs="+", help='"module" or "module name=value ..."')
+    resume_parser.add_argument("--prices", default="TutorialData.csv")
+    args = parser.parse_args()
+
+    if args.command == "save":
+        result, paths = run_with_checkpoints(Backtester(make_trader(*parse_variant(args.variant))), args.prices, [(args.day, timestamp) for timestamp in args.at], args.out)
+        print(result.summary())
+        for path in paths:
+            print(f"saved {path} ({os.path.getsize(path)} bytes)")
+    else:
+        checkpoint = Checkpoint.load(args.checkpoint)
+        backtesters = [Backtester(make_trader(*parse_variant(spec))) for spec in args.variants]
+        print(f"resuming from day {checkpoint.day} timestamp {checkpoint.timestamp}")
+        print(side_by_side(args.variants, resume(checkpoint, backtesters, args.prices)))
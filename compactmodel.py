@@ -0,0 +1,171 @@
+import json
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from datamodel import Observation, OrderDepth, Position, Product, ProsperityEncoder, Symbol, Time, UserId
+
+# __slots__ versions of the datamodel classes for long replays. Constructors, attributes and
+# __str__/__repr__ match datamodel, so traders cannot tell them apart. datamodel.py is the
+# exchange's file and stays as shipped; its ProsperityEncoder only knows __dict__, so JSON of
+# these classes goes through serializable / CompactEncoder here, in backtest code only.
+
+
+def serializable(o):
+    # Plain classes serialize through __dict__; __slots__ classes through their slots, or
+    # through to_json_value() if they need a different shape
+    to_json_value = getattr(o, "to_json_value", None)
+    if to_json_value is not None:
+        return to_json_value()
+    try:
+        return o.__dict__
+    except AttributeError:
+        return {name: getattr(o, name) for name in o.__slots__}
+
+
+class CompactEncoder(ProsperityEncoder):
+
+    def default(self, o):
+        return serializable(o)
+
+
+class Listing:
+    __slots__ = ("symbol", "product", "denomination")
+
+    def __init__(self, symbol: Symbol, product: Product, denomination: Product):
+        self.symbol = symbol
+        self.product = product
+        self.denomination = denomination
+
+
+class ConversionObservation:
+    __slots__ = ("bidPrice", "askPrice", "transportFees", "exportTariff", "importTariff", "sugarPrice", "sunlightIndex")
+
+    def __init__(self, bidPrice: float, askPrice: float, transportFees: float, exportTariff: float, importTariff: float, sugarPrice: float, sunlightIndex: float):
+        self.bidPrice = bidPrice
+        self.askPrice = askPrice
+        self.transportFees = transportFees
+        self.exportTariff = exportTariff
+        self.importTariff = importTariff
+        self.sugarPrice = sugarPrice
+        self.sunlightIndex = sunlightIndex
+
+
+class Order:
+    __slots__ = ("symbol", "price", "quantity")
+
+    def __init__(self, symbol: Symbol, price: int, quantity: int) -> None:
+        self.symbol = symbol
+        self.price = price
+        self.quantity = quantity
+
+    def __str__(self) -> str:
+        return "(" + self.symbol + ", " + str(self.price) + ", " + str(self.quantity) + ")"
+
+    def __repr__(self) -> str:
+        return "(" + self.symbol + ", " + str(self.price) + ", " + str(self.quantity) + ")"
+
+
+class Trade:
+    __slots__ = ("symbol", "price", "quantity", "buyer", "seller", "timestamp")
+
+    def __init__(self, symbol: Symbol, price: int, quantity: int, buyer: UserId=None, seller: UserId=None, timestamp: int=0) -> None:
+        self.symbol = symbol
+        self.price: int = price
+        self.quantity: int = quantity
+        self.buyer = buyer
+        self.seller = seller
+        self.timestamp = timestamp
+
+    def __str__(self) -> str:
+        return "(" + self.symbol + ", " + self.buyer + " << " + self.seller + ", " + str(self.price) + ", " + str(self.quantity) + ", " + str(self.timestamp) + ")"
+
+    def __repr__(self) -> str:
+        return "(" + self.symbol + ", " + self.buyer + " << " + self.seller + ", " + str(self.price) + ", " + str(self.quantity) + ", " + str(self.timestamp) + ")"
+
+
+class TradingState:
+    __slots__ = ("traderData", "timestamp", "listings", "order_depths", "own_trades", "market_trades", "position", "observations")
+
+    def __init__(self,
+                 traderData: str,
+                 timestamp: Time,
+                 listings: Dict[Symbol, Listing],
+                 order_depths: Dict[Symbol, OrderDepth],
+                 own_trades: Dict[Symbol, List[Trade]],
+                 market_trades: Dict[Symbol, List[Trade]],
+                 position: Dict[Product, Position],
+                 observations: Observation):
+        self.traderData = traderData
+        self.timestamp = timestamp
+        self.listings = listings
+        self.order_depths = order_depths
+        self.own_trades = own_trades
+        self.market_trades = market_trades
+        self.position = position
+        self.observations = observations
+
+    def toJSON(self):
+        return json.dumps(self, default=serializable, sort_keys=True)
+
+
+class TradeBatch:
+    """All trades of one symbol as parallel columns: int64 arrays for price, quantity and
+    timestamp, lists for buyer and seller.
+
+    Iterating yields Trade objects for code written against lists of trades; hot paths should
+    use rows() or the columns directly, which create no per-trade objects.
+    """
+
+    __slots__ = ("symbol", "price", "quantity", "timestamp", "buyer", "seller")
+
+    def __init__(self, symbol: Symbol) -> None:
+        self.symbol = symbol
+        self.price = array("q")
+        self.quantity = array("q")
+        self.timestamp = array("q")
+        self.buyer: List[Optional[UserId]] = []
+        self.seller: List[Optional[UserId]] = []
+
+    @classmethod
+    def from_trades(cls, symbol: Symbol, trades) -> "TradeBatch":
+        batch = cls(symbol)
+        for trade in trades:
+            batch.append(trade.price, trade.quantity, trade.buyer, trade.seller, trade.timestamp)
+        return batch
+
+    def append(self, price: int, quantity: int, buyer: UserId = None, seller: UserId = None, timestamp: int = 0) -> None:
+        self.price.append(price)
+        self.quantity.append(quantity)
+        self.timestamp.append(timestamp)
+        self.buyer.append(buyer)
+        self.seller.append(seller)
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def __getitem__(self, i: int) -> Trade:
+        return Trade(self.symbol, self.price[i], self.quantity[i], self.buyer[i], self.seller[i], self.timestamp[i])
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(len(self.price)):
+            yield self[i]
+
+    def rows(self) -> Iterator[Tuple[int, int, Optional[UserId], Optional[UserId], int]]:
+        """(price, quantity, buyer, seller, timestamp) tuples."""
+        return zip(self.price, self.quantity, self.buyer, self.seller, self.timestamp)
+
+    def compressed(self) -> List[List[Any]]:
+        """Rows in Logger.compress_trades layout."""
+        symbol = self.symbol
+        return [
+            [symbol, price, quantity, buyer, seller, timestamp]
+            for price, quantity, buyer, seller, timestamp in self.rows()
+        ]
+
+    def to_json_value(self) -> List[Dict[str, Any]]:
+        # Same shape as a list of datamodel Trade objects through ProsperityEncoder
+        symbol = self.symbol
+        return [
+            {"symbol": symbol, "price": price, "quantity": quantity, "buyer": buyer, "seller": seller, "timestamp": timestamp}
+            for price, quantity, buyer, seller, timestamp in self.rows()
+        ]
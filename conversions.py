@@ -0,0 +1,122 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from datamodel import ConversionObservation, Observation, Product
+
+# Conversion arbitrage from ConversionObservation data.
+#
+# Converting imports (covers a short) at askPrice + transportFees + importTariff, or exports
+# (unwinds a long) at bidPrice - transportFees - exportTariff, up to CONVERSION_LIMIT units per
+# tick and never more than the current position. Against the local book that gives:
+#   import_edge  local best bid - import cost       (sell here, buy abroad)
+#   export_edge  export proceeds - local best ask   (buy here, sell abroad)
+# ConversionHistory keeps observations as columns (one array('d') per field) for vectorized
+# analysis in conversions_batch.py; ConversionArbitrage decides a tick's conversion count from
+# the current observation and the trader's book, so run never has to look back. The exchange
+# runs a trader file on its own, so the traders carry a copy of ConversionArbitrage.
+
+CONVERSION_LIMIT = 10
+FIELDS = ("bidPrice", "askPrice", "transportFees", "exportTariff", "importTariff", "sugarPrice", "sunlightIndex")
+CHUNKSIZE = 50_000
+OBSERVATION_DTYPES = {"day": "int64", "timestamp": "int64", **{field: "float64" for field in FIELDS}}
+
+
+def import_cost(observation: ConversionObservation) -> float:
+    return observation.askPrice + observation.transportFees + observation.importTariff
+
+
+def export_proceeds(observation: ConversionObservation) -> float:
+    return observation.bidPrice - observation.transportFees - observation.exportTariff
+
+
+class ConversionHistory:
+    """Per-product columns of conversion observations: day, timestamp and every FIELDS entry."""
+
+    def __init__(self) -> None:
+        self.columns: Dict[Product, Dict[str, array]] = {}
+
+    def _product(self, product: Product) -> Dict[str, array]:
+        columns = self.columns.get(product)
+        if columns is None:
+            columns = self.columns[product] = {"day": array("q"), "timestamp": array("q"), **{field: array("d") for field in FIELDS}}
+        return columns
+
+    def append(self, product: Product, day: int, timestamp: int, observation: ConversionObservation) -> None:
+        columns = self._product(product)
+        columns["day"].append(day)
+        columns["timestamp"].append(timestamp)
+        for field in FIELDS:
+            columns[field].append(getattr(observation, field))
+
+    def add_observation(self, day: int, timestamp: int, observation: Observation) -> None:
+        for product, conversion in observation.conversionObservations.items():
+            self.append(product, day, timestamp, conversion)
+
+    def read_csv(self, product: Product, paths: Iterable[str], chunksize: int = CHUNKSIZE, delimiter: str = ";") -> None:
+        """Append observations files (timestamp;bidPrice;...;sunlightIndex, day from the file
+        name unless there is a day column) in chunks."""
+        import pandas as pd
+
+        from marketdata import day_from_filename
+
+        columns = self._product(product)
+        for path in paths:
+            file_day = day_from_filename(path)
+            for chunk in pd.read_csv(path, sep=delimiter, dtype=OBSERVATION_DTYPES, chunksize=chunksize):
+                if "day" in chunk:
+                    columns["day"].extend(chunk["day"].tolist())
+                elif file_day is not None:
+                    columns["day"].extend([file_day] * len(chunk))
+                else:
+                    raise ValueError(f"{path}: no day column and no day_<n> in the file name")
+                columns["timestamp"].extend(chunk["timestamp"].tolist())
+                for field in FIELDS:
+                    columns[field].extend(chunk[field].tolist())
+
+    @property
+    def products(self) -> List[Product]:
+        return list(self.columns)
+
+    def arrays(self, product: Product):
+        """The product's columns as numpy arrays (int64 day and timestamp, float64 fields)."""
+        import numpy as np
+
+        columns = self.columns[product]
+        return {name: np.frombuffer(values, dtype=np.int64 if values.typecode == "q" else np.float64).copy() for name, values in columns.items()}
+
+
+class ConversionArbitrage:
+    """Per-tick conversion decision. A short is covered by importing when that is cheaper than
+    the local best ask, a long is unwound by exporting when that beats the local best bid. With
+    the relevant side of the local book missing there is nothing to compare with, so nothing
+    is converted."""
+
+    def __init__(self, limit: int = CONVERSION_LIMIT, min_edge: float = 0.0) -> None:
+        self.limit = limit
+        self.min_edge = min_edge
+        self.import_edge: Optional[float] = None
+        self.export_edge: Optional[float] = None
+
+    def best_conversions(self, observation: ConversionObservation, position: int, best_bid: Optional[float], best_ask: Optional[float]) -> int:
+        cost = import_cost(observation)
+        proceeds = export_proceeds(observation)
+        self.import_edge = best_bid - cost if best_bid is not None else None
+        self.export_edge = proceeds - best_ask if best_ask is not None else None
+
+        if position < 0 and best_ask is not None and best_ask - cost > self.min_edge:
+            return min(-position, self.limit)
+        if position > 0 and best_bid is not None and proceeds - best_bid > self.min_edge:
+            return min(position, self.limit)
+        return 0
+
+    def conversions(self, state, books: Dict[Product, Any]) -> int:
+        """The conversion count to return from Trader.run, given the BookView (or anything with
+        best_bid and best_ask) the trader built for each product this tick. The exchange takes
+        one count per tick and only one product per round is convertible, so the first observed
+        product decides."""
+        for product, observation in state.observations.conversionObservations.items():
+            book = books.get(product)
+            best_bid = book.best_bid if book is not None else None
+            best_ask = book.best_ask if book is not None else None
+            return self.best_conversions(observation, state.position.get(product, 0), best_bid, best_ask)
+        return 0
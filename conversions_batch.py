@@ -0,0 +1,53 @@
+import argparse
+from typing import Dict, Optional
+
+import numpy as np
+
+from conversions import CONVERSION_LIMIT, ConversionHistory
+
+# Vectorized conversion analysis over a ConversionHistory: import cost, export proceeds and
+# edges against the local book for every observation, and the conversion count
+# ConversionArbitrage would choose at each of them.
+
+
+def edges(columns: Dict[str, np.ndarray], best_bid: Optional[np.ndarray] = None, best_ask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """import_cost and export_proceeds for every row; with local best prices (NaN where a side
+    is missing) also import_edge and export_edge."""
+    transport = np.asarray(columns["transportFees"])
+    result = {
+        "import_cost": np.asarray(columns["askPrice"]) + transport + np.asarray(columns["importTariff"]),
+        "export_proceeds": np.asarray(columns["bidPrice"]) - transport - np.asarray(columns["exportTariff"]),
+    }
+    if best_bid is not None:
+        result["import_edge"] = np.asarray(best_bid, dtype=np.float64) - result["import_cost"]
+    if best_ask is not None:
+        result["export_edge"] = result["export_proceeds"] - np.asarray(best_ask, dtype=np.float64)
+    return result
+
+
+def best_conversions_batch(columns: Dict[str, np.ndarray], position: np.ndarray, best_bid: np.ndarray, best_ask: np.ndarray, limit: int = CONVERSION_LIMIT, min_edge: float = 0.0) -> np.ndarray:
+    """ConversionArbitrage.best_conversions for every row at once."""
+    prices = edges(columns)
+    position = np.asarray(position)
+    best_bid = np.asarray(best_bid, dtype=np.float64)
+    best_ask = np.asarray(best_ask, dtype=np.float64)
+    # A missing local side (NaN) compares False, so those rows do not convert
+    cover = (position < 0) & (best_ask - prices["import_cost"] > min_edge)
+    unwind = (position > 0) & (prices["export_proceeds"] - best_bid > min_edge)
+    return np.where(cover | unwind, np.minimum(np.abs(position), limit), 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import/export edges over a conversion observations file.")
+    parser.add_argument("observations", nargs="+", help="observations CSV files, in day order")
+    parser.add_argument("--product", default="MAGNIFICENT_MACARONS")
+    args = parser.parse_args()
+
+    history = ConversionHistory()
+    history.read_csv(args.product, args.observations)
+    columns = history.arrays(args.product)
+    result = edges(columns)
+    spread = result["import_cost"] - result["export_proceeds"]
+    print(f"{args.product}: {len(columns['timestamp'])} observations")
+    for name, values in (("import cost", result["import_cost"]), ("export proceeds", result["export_proceeds"]), ("round trip cost", spread)):
+        print(f"{name}: mean={values.mean():.2f} min={values.min():.2f} max={values.max():.2f}")
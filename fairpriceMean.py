@@ -1,43 +1,80 @@
-import jsonpickle
+import base64
+from bisect import bisect_left, bisect_right
 import json
-from typing import Any, List
-from datamodel import Listing, Observation, Order, OrderDepth, ProsperityEncoder, Symbol, Trade, TradingState
 import math
+import zlib
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datamodel import ConversionObservation, Listing, Observation, Order, OrderDepth, Product, ProsperityEncoder, Symbol, Trade, TradingState
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
 
 class Logger:
-    def __init__(self) -> None:
+    def __init__(self, enabled: bool = True, level: int = INFO) -> None:
         self.logs = ""
         self.max_log_length = 3750
-
-    def print(self, *objects: Any, sep: str = " ", end: str = "\n") -> None:
-        self.logs += sep.join(map(str, objects)) + end
+        # Backtests that throw the output away can turn logging off entirely
+        self.enabled = enabled
+        self.level = level
+        # flush splits what is left of max_log_length after the state three ways and keeps at
+        # most that share of the logs, so once a third is used further messages are dropped
+        # before they are formatted
+        self.log_budget = self.max_log_length // 3
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self.enabled and level >= self.level and len(self.logs) < self.log_budget
+
+    def print(self, *objects: Any, sep: str = " ", end: str = "\n", level: int = INFO) -> None:
+        # Callables are evaluated only if the message is actually kept
+        if not self.is_enabled_for(level):
+            return
+        self.logs += sep.join(str(o() if callable(o) else o) for o in objects) + end
+
+    def log(self, level: int, message: Any, *args: Any) -> None:
+        # message is a %-format string for args, or a callable returning the full message
+        if not self.is_enabled_for(level):
+            return
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+        self.logs += message + "\n"
+
+    def debug(self, message: Any, *args: Any) -> None:
+        self.log(DEBUG, message, *args)
+
+    def info(self, message: Any, *args: Any) -> None:
+        self.log(INFO, message, *args)
+
+    def warning(self, message: Any, *args: Any) -> None:
+        self.log(WARNING, message, *args)
 
     def flush(self, state: TradingState, orders: dict[Symbol, list[Order]], conversions: int, trader_data: str) -> None:
-        base_length = len(
-            self.to_json(
-                [
-                    self.compress_state(state, ""),
-                    self.compress_orders(orders),
-                    conversions,
-                    "",
-                    "",
-                ]
-            )
-        )
+        if not self.enabled:
+            self.logs = ""
+            return
+
+        # Serialize everything except the three variable strings once, then splice them in:
+        # [[timestamp,<state.traderData>,...rest of state],orders,conversions,<trader_data>,<logs>]
+        compressed_state = self.compress_state(state, "")
+        prefix = "[[" + self.to_json(compressed_state[0]) + ","
+        middle = "," + self.to_json(compressed_state[2:])[1:-1] + "]," + self.to_json(self.compress_orders(orders)) + "," + self.to_json(conversions) + ","
+        base_length = len(prefix) + len(middle) + len('"",""]') + len('""')
 
         # We truncate state.traderData, trader_data, and self.logs to the same max. length to fit the log limit
         max_item_length = (self.max_log_length - base_length) // 3
 
         print(
-            self.to_json(
-                [
-                    self.compress_state(state, self.truncate(state.traderData, max_item_length)),
-                    self.compress_orders(orders),
-                    conversions,
-                    self.truncate(trader_data, max_item_length),
-                    self.truncate(self.logs, max_item_length),
-                ]
-            )
+            prefix
+            + self.to_json(self.truncate(state.traderData, max_item_length))
+            + middle
+            + self.to_json(self.truncate(trader_data, max_item_length))
+            + ","
+            + self.to_json(self.truncate(self.logs, max_item_length))
+            + "]"
         )
 
         self.logs = ""
@@ -71,6 +108,11 @@ class Logger:
     def compress_trades(self, trades: dict[Symbol, list[Trade]]) -> list[list[Any]]:
         compressed = []
         for arr in trades.values():
+            # Columnar batches (compactmodel.TradeBatch) compress themselves
+            batch_compressed = getattr(arr, "compressed", None)
+            if batch_compressed is not None:
+                compressed.extend(batch_compressed())
+                continue
             for trade in arr:
                 compressed.append(
                     [
@@ -119,23 +161,372 @@ class Logger:
 
 
 logger = Logger()
+
+
+# The exchange runs this file on its own: only datamodel, the standard library, jsonpickle,
+# numpy and pandas can be imported there. Helpers the strategy needs are therefore copied in
+# below; the sibling modules (indicators.py, ...) are the versions the backtest tools use.
+
+
+class SMA:
+    """Simple moving average over the last ``window`` values, kept as a ring buffer plus a
+    running sum. The sum is recomputed once per wrap so float error cannot accumulate."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: List[float] = []
+        self.head = 0
+        self.total = 0.0
+
+    def update(self, value: float) -> float:
+        if len(self.values) < self.window:
+            self.values.append(value)
+            self.total += value
+        else:
+            self.total += value - self.values[self.head]
+            self.values[self.head] = value
+            self.head += 1
+            if self.head == self.window:
+                self.head = 0
+                self.total = sum(self.values)
+
+        return self.total / len(self.values)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.total / len(self.values) if self.values else None
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    def oldest(self) -> float:
+        return self.values[self.head] if self.ready else self.values[0]
+
+    def to_state(self) -> List[Any]:
+        return [self.window, self.head, self.total, self.values]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "SMA":
+        indicator = cls(state[0])
+        indicator.head = state[1]
+        indicator.total = state[2]
+        indicator.values = state[3]
+        return indicator
+
+
+class BookView:
+    """Read-only, price-sorted view of an OrderDepth, built once per product per tick.
+
+    Volumes keep the OrderDepth sign convention (asks are negative). Best prices, spread and
+    mid are computed up front; "first level beyond X" lookups are bisects over sorted prices.
+    """
+
+    __slots__ = ("order_depth", "bid_prices", "ask_prices", "best_bid", "best_ask", "best_bid_volume", "best_ask_volume")
+
+    def __init__(self, order_depth: OrderDepth) -> None:
+        self.order_depth = order_depth
+        # Both ascending so bisect works the same way on each side
+        self.bid_prices: List[int] = sorted(order_depth.buy_orders)
+        self.ask_prices: List[int] = sorted(order_depth.sell_orders)
+
+        self.best_bid: Optional[int] = self.bid_prices[-1] if self.bid_prices else None
+        self.best_ask: Optional[int] = self.ask_prices[0] if self.ask_prices else None
+        self.best_bid_volume = order_depth.buy_orders[self.best_bid] if self.best_bid is not None else 0
+        self.best_ask_volume = order_depth.sell_orders[self.best_ask] if self.best_ask is not None else 0
+
+    @property
+    def spread(self) -> Optional[int]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_ask + self.best_bid) / 2
+
+    def bids(self) -> List[Tuple[int, int]]:
+        """Bid levels, best (highest) first."""
+        buy_orders = self.order_depth.buy_orders
+        return [(price, buy_orders[price]) for price in reversed(self.bid_prices)]
+
+    def asks(self) -> List[Tuple[int, int]]:
+        """Ask levels, best (lowest) first."""
+        sell_orders = self.order_depth.sell_orders
+        return [(price, sell_orders[price]) for price in self.ask_prices]
+
+    def first_ask_above(self, price: float) -> Optional[int]:
+        i = bisect_right(self.ask_prices, price)
+        return self.ask_prices[i] if i < len(self.ask_prices) else None
+
+    def first_bid_below(self, price: float) -> Optional[int]:
+        i = bisect_left(self.bid_prices, price)
+        return self.bid_prices[i - 1] if i > 0 else None
+
+    def ask_volume_at_or_below(self, price: float) -> int:
+        """Total (positive) ask volume that a buy at ``price`` could take."""
+        sell_orders = self.order_depth.sell_orders
+        return -sum(sell_orders[p] for p in self.ask_prices[: bisect_right(self.ask_prices, price)])
+
+    def bid_volume_at_or_above(self, price: float) -> int:
+        """Total bid volume that a sell at ``price`` could take."""
+        buy_orders = self.order_depth.buy_orders
+        return sum(buy_orders[p] for p in self.bid_prices[bisect_left(self.bid_prices, price):])
+
+
+# Book-derived fair value, copied from fairvalue.py.
+
+SOURCES = ("microprice", "vwap_mid")
+
+
+def microprice(best_bid: float, bid_volume: float, best_ask: float, ask_volume: float) -> float:
+    return (best_bid * ask_volume + best_ask * bid_volume) / (bid_volume + ask_volume)
+
+
+class FairValue:
+
+    def __init__(self, alpha: float = 0.1, source: str = "vwap_mid") -> None:
+        if source not in SOURCES:
+            raise ValueError(f"source must be one of {SOURCES}, got {source!r}")
+        self.alpha = alpha
+        self.source = source
+        self.microprice: Optional[float] = None
+        self.vwap_mid: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, order_depth: OrderDepth) -> Optional[float]:
+        buy_orders, sell_orders = order_depth.buy_orders, order_depth.sell_orders
+        if buy_orders and sell_orders:
+            best_bid = best_bid_volume = best_ask = best_ask_volume = None
+            bid_notional = bid_volume = 0
+            for price, volume in buy_orders.items():
+                bid_notional += price * volume
+                bid_volume += volume
+                if best_bid is None or price > best_bid:
+                    best_bid, best_bid_volume = price, volume
+            ask_notional = ask_volume = 0
+            for price, volume in sell_orders.items():
+                # Ask volumes are negative in an OrderDepth
+                ask_notional -= price * volume
+                ask_volume -= volume
+                if best_ask is None or price < best_ask:
+                    best_ask, best_ask_volume = price, -volume
+
+            self.microprice = microprice(best_bid, best_bid_volume, best_ask, best_ask_volume)
+            self.vwap_mid = (bid_notional / bid_volume + ask_notional / ask_volume) / 2
+            estimate = self.microprice if self.source == "microprice" else self.vwap_mid
+            self.value = estimate if self.value is None else self.value + self.alpha * (estimate - self.value)
+
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def to_state(self) -> List[Any]:
+        return [self.alpha, self.source, self.value, self.microprice, self.vwap_mid]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "FairValue":
+        engine = cls(state[0], state[1])
+        engine.value, engine.microprice, engine.vwap_mid = state[2], state[3], state[4]
+        return engine
+
+
+# Conversion decision, copied from conversions.py.
+
+CONVERSION_LIMIT = 10
+
+
+def import_cost(observation: ConversionObservation) -> float:
+    return observation.askPrice + observation.transportFees + observation.importTariff
+
+
+def export_proceeds(observation: ConversionObservation) -> float:
+    return observation.bidPrice - observation.transportFees - observation.exportTariff
+
+
+class ConversionArbitrage:
+    """Per-tick conversion decision. A short is covered by importing when that is cheaper than
+    the local best ask, a long is unwound by exporting when that beats the local best bid. With
+    the relevant side of the local book missing there is nothing to compare with, so nothing
+    is converted."""
+
+    def __init__(self, limit: int = CONVERSION_LIMIT, min_edge: float = 0.0) -> None:
+        self.limit = limit
+        self.min_edge = min_edge
+        self.import_edge: Optional[float] = None
+        self.export_edge: Optional[float] = None
+
+    def best_conversions(self, observation: ConversionObservation, position: int, best_bid: Optional[float], best_ask: Optional[float]) -> int:
+        cost = import_cost(observation)
+        proceeds = export_proceeds(observation)
+        self.import_edge = best_bid - cost if best_bid is not None else None
+        self.export_edge = proceeds - best_ask if best_ask is not None else None
+
+        if position < 0 and best_ask is not None and best_ask - cost > self.min_edge:
+            return min(-position, self.limit)
+        if position > 0 and best_bid is not None and proceeds - best_bid > self.min_edge:
+            return min(position, self.limit)
+        return 0
+
+    def conversions(self, state, books: Dict[Product, Any]) -> int:
+        """The conversion count to return from Trader.run, given the BookView (or anything with
+        best_bid and best_ask) the trader built for each product this tick. The exchange takes
+        one count per tick and only one product per round is convertible, so the first observed
+        product decides."""
+        for product, observation in state.observations.conversionObservations.items():
+            book = books.get(product)
+            best_bid = book.best_bid if book is not None else None
+            best_ask = book.best_ask if book is not None else None
+            return self.best_conversions(observation, state.position.get(product, 0), best_bid, best_ask)
+        return 0
+
+
+# traderData codec, copied from traderdata.py without RingBuffer support (nothing here stores
+# one). Output is "<schema>:<j|z>:<payload>"; see traderdata.py for the format.
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _pack_list(values: List[Any]) -> Any:
+    # Only homogeneous lists are packed, so decoding gives back exactly the same types
+    if all(type(v) is float for v in values):
+        typecode = "d"
+    elif all(type(v) is int for v in values) and all(-(2 ** 63) <= v < 2 ** 63 for v in values):
+        typecode = "q"
+    else:
+        return None
+
+    # A packed value costs 32/3 base64 characters; short decimals such as 2028.5 are cheaper as
+    # text. Estimate the text size from a few evenly spaced samples rather than every element.
+    step = max(1, len(values) // 4)
+    samples = values[::step]
+    text_length = (sum(len(repr(v)) for v in samples) / len(samples) + 1) * len(values)
+    if text_length <= math.ceil(8 * len(values) / 3) * 4 + 8:
+        return None
+    return {"#" + typecode: _b64(array(typecode, values).tobytes())}
+
+
+class TraderDataCodec:
+
+    def __init__(self, schema: int = 1, migrations: Optional[Dict[int, Callable[[Any], Any]]] = None, compress_threshold: int = 512, pack_threshold: int = 8) -> None:
+        # migrations[n] turns a decoded schema-n object into a schema n + 1 object
+        self.schema = schema
+        self.migrations = migrations or {}
+        self.compress_threshold = compress_threshold
+        self.pack_threshold = pack_threshold
+
+    def encode(self, obj: Any) -> str:
+        payload = json.dumps(self._pack(obj), separators=(",", ":"))
+        if len(payload) >= self.compress_threshold:
+            compressed = _b64(zlib.compress(payload.encode("utf-8"), 1))
+            if len(compressed) < len(payload):
+                return f"{self.schema}:z:{compressed}"
+
+        return f"{self.schema}:j:{payload}"
+
+    def decode(self, data: Optional[str], default: Any = None) -> Any:
+        if not data:
+            return {} if default is None else default
+
+        schema, flag, payload = self._split(data)
+        if flag == "z":
+            payload = zlib.decompress(base64.b64decode(payload)).decode("utf-8")
+        obj = self._unpack(json.loads(payload))
+
+        while schema < self.schema:
+            migrate = self.migrations.get(schema)
+            if migrate is not None:
+                obj = migrate(obj)
+            schema += 1
+
+        return obj
+
+    def _split(self, data: str):
+        first = data.find(":")
+        if first > 0 and data[:first].isdigit() and data[first + 1 : first + 3] in ("j:", "z:"):
+            return int(data[:first]), data[first + 1], data[first + 3 :]
+        return 0, "j", data
+
+    def _pack(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return {("#" + key if isinstance(key, str) and key.startswith("#") else key): self._pack(value) for key, value in obj.items()}
+        if isinstance(obj, array) and obj.typecode in ("d", "q"):
+            return {"#" + obj.typecode: _b64(obj.tobytes())}
+        if isinstance(obj, (list, tuple)):
+            if len(obj) >= self.pack_threshold:
+                packed = _pack_list(obj)
+                if packed is not None:
+                    return packed
+            return [self._pack(value) for value in obj]
+        return obj
+
+    def _unpack(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            if len(obj) == 1:
+                key = next(iter(obj))
+                if key in ("#d", "#q"):
+                    return array(key[1], base64.b64decode(obj[key])).tolist()
+            return {(key[1:] if key.startswith("#") else key): self._unpack(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self._unpack(value) for value in obj]
+        return obj
+
+
+def migrate_legacy_state(traderObject: dict) -> dict:
+    """Schema 0 -> 1: the jsonpickle-era computeMA kept the last n mids as a plain list under
+    "<n>Mps" (oldest first). Turn each into the SMA state "SMA<n>" and drop the list."""
+    for key in [key for key in traderObject if key.endswith("Mps") and key[:-3].isdigit()]:
+        values = traderObject.pop(key)
+        window = int(key[:-3])
+        values = values[-window:]
+        traderObject[f"SMA{window}"] = [window, 0, float(sum(values)), values]
+    return traderObject
+
+
+codec = TraderDataCodec(migrations={0: migrate_legacy_state})
+
+
+class MarketMakerParams:
+    """Tunable constants of the market-making strategy (see sweep.py)."""
+
+    def __init__(self,
+                 acceptable_prices: dict[str, int] = None,
+                 max_position: int = 50,
+                 resin_quote_size: int = 15,
+                 kelp_quote_size: int = 20,
+                 short_window: int = 5,
+                 long_window: int = 10,
+                 kelp_fair_alpha: float = 0.0):
+        self.acceptable_prices = acceptable_prices if acceptable_prices is not None else {"KELP": 2019, "RAINFOREST_RESIN": 10000}
+        self.max_position = max_position
+        self.resin_quote_size = resin_quote_size
+        self.kelp_quote_size = kelp_quote_size
+        self.short_window = short_window
+        self.long_window = long_window
+        # Weight of the book-derived KELP fair value (fairvalue.py); 0 keeps acceptable_prices
+        self.kelp_fair_alpha = kelp_fair_alpha
+
+
 class Trader:
+    def __init__(self, params: MarketMakerParams = None):
+        self.params = params if params is not None else MarketMakerParams()
+        self.converter = ConversionArbitrage()
+
     def computeMA(self, order_depth: OrderDepth, filterOrder: int, traderObject: dict) -> float:
         if len(order_depth.buy_orders)!=0 and len(order_depth.sell_orders)!=0:
             midprice = (min(order_depth.sell_orders.keys()) + max(order_depth.buy_orders.keys()))/2
-            if f"{filterOrder}MA" not in traderObject:
-                traderObject[f"{filterOrder}MA"] = midprice
-                traderObject[f"{filterOrder}Mps"]= []
-                traderObject[f"{filterOrder}Mps"].append(midprice)
-
-            elif len(traderObject[f"{filterOrder}Mps"])<=(filterOrder-1):
-                traderObject[f"{filterOrder}Mps"].append(midprice)
-                traderObject[f"{filterOrder}MA"] = sum(traderObject[f"{filterOrder}Mps"])/len(traderObject[f"{filterOrder}Mps"])
-            else:
-                traderObject[f"{filterOrder}Mps"].append(midprice)
-                traderObject[f"{filterOrder}MA"] = sum(traderObject[f"{filterOrder}Mps"])/len(traderObject[f"{filterOrder}Mps"])
-                traderObject[f"{filterOrder}Mps"].pop(0)
-            
+            # Running-sum SMA: O(1) per tick, and only a flat list goes into traderData
+            key = f"SMA{filterOrder}"
+            sma = SMA.from_state(traderObject[key]) if key in traderObject else SMA(filterOrder)
+            traderObject[f"{filterOrder}MA"] = sma.update(midprice)
+            traderObject[key] = sma.to_state()
+
             return traderObject[f"{filterOrder}MA"]
         else:
             return 0
@@ -144,112 +535,111 @@ class Trader:
     
     def run(self, state: TradingState):
         # Only method required. It takes all buy and sell orders for all symbols as an input, and outputs a list of orders to be sent
-        logger.print("traderData: " + state.traderData)
-        logger.print("Observations: " + str(state.observations))
-        traderObject = {}
-        if state.traderData != None and state.traderData != "":
-            traderObject = jsonpickle.decode(state.traderData)
+        logger.log(DEBUG, "traderData: %s", state.traderData)
+        # str(Observation) jsonpickles every observation, so only build it if DEBUG is on
+        logger.log(DEBUG, lambda: "Observations: " + str(state.observations))
+        traderObject = codec.decode(state.traderData)
+        params = self.params
     
         result = {}
+        books: Dict[Symbol, BookView] = {}
 
         for product in state.order_depths:
             order_depth: OrderDepth = state.order_depths[product]
             orders: List[Order] = []
-            logger.print(f"position for {product} is {state.position.get(product, 0)}")
-            acceptable_prices={"KELP": 2019, "RAINFOREST_RESIN": 10000}
+            book = books[product] = BookView(order_depth)
+            logger.log(INFO, "position for %s is %s", product, state.position.get(product, 0))
+            acceptable_prices=params.acceptable_prices
             current_pos = state.position.get(product, 0)
-            can_sell = max(0, 50 + current_pos)   
-            can_buy = max(0, 50 - current_pos)
+            can_sell = max(0, params.max_position + current_pos)   
+            can_buy = max(0, params.max_position - current_pos)
 
             if product=="RAINFOREST_RESIN":
-                # Filter out any bid asks within 1 tick of fair value. 
-                asks_above_fair = [
-                    price
-                    for price in order_depth.sell_orders.keys()
-                    if price > 10000 + 1
-                ]
-                bids_below_fair = [
-                    price
-                    for price in order_depth.buy_orders.keys()
-                    if price < 10000 - 1
-                ]
-                
-                best_ask_above_fair = min(asks_above_fair) if len(asks_above_fair) > 0 else None
-                best_bid_below_fair = max(bids_below_fair) if len(bids_below_fair) > 0 else None
+                # Ignore any bid asks within 1 tick of fair value. 
+                best_ask_above_fair = book.first_ask_above(params.acceptable_prices["RAINFOREST_RESIN"] + 1)
+                best_bid_below_fair = book.first_bid_below(params.acceptable_prices["RAINFOREST_RESIN"] - 1)
 
-                if len(order_depth.sell_orders) != 0:
-                    best_ask, best_ask_amount = list(order_depth.sell_orders.items())[0]
+                if book.best_ask is not None:
+                    best_ask, best_ask_amount = book.best_ask, book.best_ask_volume
                     if int(best_ask) < acceptable_prices[product]: #LOGIC TO EXECUTE ARBITRAGE BY BUYING BELOW FAIR VALUE
-                        logger.print("BUY", str(-best_ask_amount) + "x", best_ask)
+                        logger.log(INFO, "BUY %sx %s", -best_ask_amount, best_ask)
                         orders.append(Order(product, best_ask, -max(best_ask_amount, -can_buy))) #e.g. if bestaskamount is -20 and we can buy 10, then -max(-20, -10) = 10
 
                     #LOGIC TO MM THE BEST ASK    
-                    if int(best_ask_above_fair)-acceptable_prices[product]==2:
-                        #This is a case like 10002 where we may as well just join onto that order rather than try and undercut it.
-                        logger.print("SELL", str(-15) + "x", best_ask_above_fair)
-                        orders.append(Order(product, best_ask_above_fair, -min(15, can_sell)))
-                    else: 
-                        #This is a case like 10003 or higher where we can undercut the best ask by 1.
-                        logger.print("SELL", str(-15) + "x", best_ask_above_fair-1)
-                        orders.append(Order(product, best_ask_above_fair-1, -min(15, can_sell)))
+                    if best_ask_above_fair is not None:
+                        if int(best_ask_above_fair)-acceptable_prices[product]==2:
+                            #This is a case like 10002 where we may as well just join onto that order rather than try and undercut it.
+                            logger.log(INFO, "SELL %sx %s", -params.resin_quote_size, best_ask_above_fair)
+                            orders.append(Order(product, best_ask_above_fair, -min(params.resin_quote_size, can_sell)))
+                        else: 
+                            #This is a case like 10003 or higher where we can undercut the best ask by 1.
+                            logger.log(INFO, "SELL %sx %s", -params.resin_quote_size, best_ask_above_fair-1)
+                            orders.append(Order(product, best_ask_above_fair-1, -min(params.resin_quote_size, can_sell)))
                             
-                if len(order_depth.buy_orders) != 0:
-                    best_bid, best_bid_amount = list(order_depth.buy_orders.items())[0]
+                if book.best_bid is not None:
+                    best_bid, best_bid_amount = book.best_bid, book.best_bid_volume
                     if int(best_bid) > acceptable_prices[product]: #LOGIC TO EXECUTE ARBITRAGE BY SELLING ABOVE FAIR VALUE
-                        logger.print("SELL", str(best_bid_amount) + "x", best_bid)
+                        logger.log(INFO, "SELL %sx %s", best_bid_amount, best_bid)
                         orders.append(Order(product, best_bid, -min(best_bid_amount, can_sell)))
                         
                     #LOGIC TO MM THE BEST BID 
-                    if acceptable_prices[product]-int(best_bid_below_fair)==2:
-                        #This is a case like 9998 where we may as well just join onto that order rather than try and undercut it.
-                        logger.print("BUY", str(15) + "x", best_bid_below_fair)
-                        orders.append(Order(product, best_bid_below_fair, min(15, can_buy)))
-                    else:
-                        #This is a case like 9997 or lower where we can improve the best bid by 1.
-                        logger.print("BUY", str(15) + "x", best_bid_below_fair+1)
-                        orders.append(Order(product, best_bid_below_fair+1, min(15, can_buy)))
+                    if best_bid_below_fair is not None:
+                        if acceptable_prices[product]-int(best_bid_below_fair)==2:
+                            #This is a case like 9998 where we may as well just join onto that order rather than try and undercut it.
+                            logger.log(INFO, "BUY %sx %s", params.resin_quote_size, best_bid_below_fair)
+                            orders.append(Order(product, best_bid_below_fair, min(params.resin_quote_size, can_buy)))
+                        else:
+                            #This is a case like 9997 or lower where we can improve the best bid by 1.
+                            logger.log(INFO, "BUY %sx %s", params.resin_quote_size, best_bid_below_fair+1)
+                            orders.append(Order(product, best_bid_below_fair+1, min(params.resin_quote_size, can_buy)))
                         
             elif product=="KELP":        
-                logger.print(self.computeMA(order_depth, 5, traderObject))
-                self.computeMA(order_depth, 10, traderObject)
-                best_ask= None
-                best_bid= None
-                if len(order_depth.sell_orders) != 0:
-                    best_ask, best_ask_amount = list(order_depth.sell_orders.items())[0]
-                    if int(best_ask) < acceptable_prices[product]-2: #LOGIC TO EXECUTE ARBITRAGE BY BUYING BELOW FAIR VALUE
-                        logger.print("BUY", str(-best_ask_amount) + "x", best_ask)
+                logger.log(INFO, "%s", self.computeMA(order_depth, params.short_window, traderObject))
+                self.computeMA(order_depth, params.long_window, traderObject)
+                fair = acceptable_prices[product]
+                if params.kelp_fair_alpha > 0:
+                    engine = FairValue.from_state(traderObject["FV"]) if "FV" in traderObject else FairValue(params.kelp_fair_alpha)
+                    if engine.update(order_depth) is not None:
+                        fair = round(engine.value)
+                    traderObject["FV"] = engine.to_state()
+                best_ask= book.best_ask
+                best_bid= book.best_bid
+                if best_ask is not None:
+                    best_ask_amount = book.best_ask_volume
+                    if int(best_ask) < fair-2: #LOGIC TO EXECUTE ARBITRAGE BY BUYING BELOW FAIR VALUE
+                        logger.log(INFO, "BUY %sx %s", -best_ask_amount, best_ask)
                         orders.append(Order(product, best_ask, -min(best_ask_amount, can_buy)))
-                        logger.print(best_ask_amount)
+                        logger.log(DEBUG, "%s", best_ask_amount)
 
-                if len(order_depth.buy_orders) != 0:
-                    best_bid, best_bid_amount = list(order_depth.buy_orders.items())[0]
-                    if int(best_bid) > acceptable_prices[product]+2: #LOGIC TO EXECUTE ARBITRAGE BY SELLING ABOVE FAIR VALUE
-                        logger.print("SELL", str(best_bid_amount) + "x", best_bid)
+                if best_bid is not None:
+                    best_bid_amount = book.best_bid_volume
+                    if int(best_bid) > fair+2: #LOGIC TO EXECUTE ARBITRAGE BY SELLING ABOVE FAIR VALUE
+                        logger.log(INFO, "SELL %sx %s", best_bid_amount, best_bid)
                         orders.append(Order(product, best_bid, -min(best_bid_amount, can_sell)))
-                        logger.print(best_bid_amount)
+                        logger.log(DEBUG, "%s", best_bid_amount)
                 
-                spread=best_ask-best_bid
+                spread=book.spread
                 if spread !=None:
                     if spread==1 or spread==2:
                         #This is a case where we may as well join volume rather than try and undercut it.
-                        logger.print("BUY", str(5) + "x", best_bid)
-                        orders.append(Order(product, best_bid, min(20, can_buy)))
-                        logger.print("SELL", str(-5) + "x", best_ask)
-                        orders.append(Order(product, best_ask, -min(20, can_sell)))
+                        logger.log(INFO, "BUY %sx %s", params.kelp_quote_size, best_bid)
+                        orders.append(Order(product, best_bid, min(params.kelp_quote_size, can_buy)))
+                        logger.log(INFO, "SELL %sx %s", -params.kelp_quote_size, best_ask)
+                        orders.append(Order(product, best_ask, -min(params.kelp_quote_size, can_sell)))
                     elif spread>2:
                         #This is a case where we can improve the best bid by 1.
-                        logger.print("BUY", str(5) + "x", best_bid+1)
-                        orders.append(Order(product, best_bid+1, min(20, can_buy)))
-                        logger.print("SELL", str(-5) + "x", best_ask-1)
-                        orders.append(Order(product, best_ask-1, -min(20, can_sell)))
+                        logger.log(INFO, "BUY %sx %s", params.kelp_quote_size, best_bid+1)
+                        orders.append(Order(product, best_bid+1, min(params.kelp_quote_size, can_buy)))
+                        logger.log(INFO, "SELL %sx %s", -params.kelp_quote_size, best_ask-1)
+                        orders.append(Order(product, best_ask-1, -min(params.kelp_quote_size, can_sell)))
 
 
 
             result[product] = orders
     
     
-        traderData = jsonpickle.encode(traderObject)
+        traderData = codec.encode(traderObject)
 
-        conversions = 1
+        conversions = self.converter.conversions(state, books)
         logger.flush(state, result, conversions, traderData)
         return result, conversions, traderData
\ No newline at end of file
@@ -1,27 +1,166 @@
-from datamodel import OrderDepth, UserId, TradingState, Order
-from typing import List
+from datamodel import ConversionObservation, OrderDepth, Product, UserId, TradingState, Order
+from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
 import json
 
+# The exchange runs this file on its own, so BookView and ConversionArbitrage are copied in
+# from orderbook.py and conversions.py.
+class BookView:
+    """Read-only, price-sorted view of an OrderDepth, built once per product per tick.
+
+    Volumes keep the OrderDepth sign convention (asks are negative). Best prices, spread and
+    mid are computed up front; "first level beyond X" lookups are bisects over sorted prices.
+    """
+
+    __slots__ = ("order_depth", "bid_prices", "ask_prices", "best_bid", "best_ask", "best_bid_volume", "best_ask_volume")
+
+    def __init__(self, order_depth: OrderDepth) -> None:
+        self.order_depth = order_depth
+        # Both ascending so bisect works the same way on each side
+        self.bid_prices: List[int] = sorted(order_depth.buy_orders)
+        self.ask_prices: List[int] = sorted(order_depth.sell_orders)
+
+        self.best_bid: Optional[int] = self.bid_prices[-1] if self.bid_prices else None
+        self.best_ask: Optional[int] = self.ask_prices[0] if self.ask_prices else None
+        self.best_bid_volume = order_depth.buy_orders[self.best_bid] if self.best_bid is not None else 0
+        self.best_ask_volume = order_depth.sell_orders[self.best_ask] if self.best_ask is not None else 0
+
+    @property
+    def spread(self) -> Optional[int]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_ask + self.best_bid) / 2
+
+    def bids(self) -> List[Tuple[int, int]]:
+        """Bid levels, best (highest) first."""
+        buy_orders = self.order_depth.buy_orders
+        return [(price, buy_orders[price]) for price in reversed(self.bid_prices)]
+
+    def asks(self) -> List[Tuple[int, int]]:
+        """Ask levels, best (lowest) first."""
+        sell_orders = self.order_depth.sell_orders
+        return [(price, sell_orders[price]) for price in self.ask_prices]
+
+    def first_ask_above(self, price: float) -> Optional[int]:
+        i = bisect_right(self.ask_prices, price)
+        return self.ask_prices[i] if i < len(self.ask_prices) else None
+
+    def first_bid_below(self, price: float) -> Optional[int]:
+        i = bisect_left(self.bid_prices, price)
+        return self.bid_prices[i - 1] if i > 0 else None
+
+    def ask_volume_at_or_below(self, price: float) -> int:
+        """Total (positive) ask volume that a buy at ``price`` could take."""
+        sell_orders = self.order_depth.sell_orders
+        return -sum(sell_orders[p] for p in self.ask_prices[: bisect_right(self.ask_prices, price)])
+
+    def bid_volume_at_or_above(self, price: float) -> int:
+        """Total bid volume that a sell at ``price`` could take."""
+        buy_orders = self.order_depth.buy_orders
+        return sum(buy_orders[p] for p in self.bid_prices[bisect_left(self.bid_prices, price):])
+
+
+CONVERSION_LIMIT = 10
+
+
+def import_cost(observation: ConversionObservation) -> float:
+    return observation.askPrice + observation.transportFees + observation.importTariff
+
+
+def export_proceeds(observation: ConversionObservation) -> float:
+    return observation.bidPrice - observation.transportFees - observation.exportTariff
+
+
+class ConversionArbitrage:
+    """Per-tick conversion decision. A short is covered by importing when that is cheaper than
+    the local best ask, a long is unwound by exporting when that beats the local best bid. With
+    the relevant side of the local book missing there is nothing to compare with, so nothing
+    is converted."""
+
+    def __init__(self, limit: int = CONVERSION_LIMIT, min_edge: float = 0.0) -> None:
+        self.limit = limit
+        self.min_edge = min_edge
+        self.import_edge: Optional[float] = None
+        self.export_edge: Optional[float] = None
+
+    def best_conversions(self, observation: ConversionObservation, position: int, best_bid: Optional[float], best_ask: Optional[float]) -> int:
+        cost = import_cost(observation)
+        proceeds = export_proceeds(observation)
+        self.import_edge = best_bid - cost if best_bid is not None else None
+        self.export_edge = proceeds - best_ask if best_ask is not None else None
+
+        if position < 0 and best_ask is not None and best_ask - cost > self.min_edge:
+            return min(-position, self.limit)
+        if position > 0 and best_bid is not None and proceeds - best_bid > self.min_edge:
+            return min(position, self.limit)
+        return 0
+
+    def conversions(self, state, books: Dict[Product, Any]) -> int:
+        """The conversion count to return from Trader.run, given the BookView (or anything with
+        best_bid and best_ask) the trader built for each product this tick. The exchange takes
+        one count per tick and only one product per round is convertible, so the first observed
+        product decides."""
+        for product, observation in state.observations.conversionObservations.items():
+            book = books.get(product)
+            best_bid = book.best_bid if book is not None else None
+            best_ask = book.best_ask if book is not None else None
+            return self.best_conversions(observation, state.position.get(product, 0), best_bid, best_ask)
+        return 0
+
+
+class ThresholdParams:
+    """Tunable constants of the threshold strategy (see sweep.py)."""
+
+    def __init__(self,
+                 acceptable_prices: Dict[str, int] = None,
+                 max_position: int = 50,
+                 kelp_small_band: int = 10,
+                 kelp_large_band: int = 25,
+                 kelp_small_buy_offset: int = -6,
+                 kelp_large_buy_offset: int = -8,
+                 kelp_small_sell_offset: int = 5,
+                 kelp_large_sell_offset: int = 6):
+        self.acceptable_prices = acceptable_prices if acceptable_prices is not None else {"KELP": 2019, "RAINFOREST_RESIN": 10000}
+        self.max_position = max_position
+        self.kelp_small_band = kelp_small_band
+        self.kelp_large_band = kelp_large_band
+        self.kelp_small_buy_offset = kelp_small_buy_offset
+        self.kelp_large_buy_offset = kelp_large_buy_offset
+        self.kelp_small_sell_offset = kelp_small_sell_offset
+        self.kelp_large_sell_offset = kelp_large_sell_offset
+
+
 class Trader:    
+    def __init__(self, params: ThresholdParams = None):
+        self.params = params if params is not None else ThresholdParams()
+        self.converter = ConversionArbitrage()
+
     def run(self, state: TradingState):
+        params = self.params
         # Print some debug info (optional)
         print("traderData: " + state.traderData)
         print("Observations: " + str(state.observations))
 
         # Hardcoded fair prices
-        acceptable_prices = {
-            "KELP": 2019,
-            "RAINFOREST_RESIN": 10000
-        }
+        acceptable_prices = params.acceptable_prices
 
         # For each product, we will place buy and/or sell orders
         result = {}
 
         # Maximum net position we allow for each product
-        MAX_POSITION = 50
+        MAX_POSITION = params.max_position
+
+        books: Dict[Product, BookView] = {}
 
         for product, order_depth in state.order_depths.items():
             orders: List[Order] = []
+            book = books[product] = BookView(order_depth)
 
             # Current net position in this product
             current_pos = state.position.get(product, 0)
@@ -35,26 +174,26 @@ class Trader:
             # Another way to think about it: if your position is +10, you can sell up to 60 before hitting -50
             base_price=acceptable_prices[product]
             if product == "KELP":
-                if current_pos >= 10 and current_pos <= 25:
-                    buy_threshold = base_price - 6
-                elif current_pos > 25:
-                    buy_threshold = base_price - 8
+                if current_pos >= params.kelp_small_band and current_pos <= params.kelp_large_band:
+                    buy_threshold = base_price + params.kelp_small_buy_offset
+                elif current_pos > params.kelp_large_band:
+                    buy_threshold = base_price + params.kelp_large_buy_offset
 
 
                 # Adjust sell threshold for short positions
-                if current_pos <= -10 and current_pos >= -25:
-                    sell_threshold = base_price + 5
-                elif current_pos < -25:
-                    sell_threshold = base_price + 6
+                if current_pos <= -params.kelp_small_band and current_pos >= -params.kelp_large_band:
+                    sell_threshold = base_price + params.kelp_small_sell_offset
+                elif current_pos < -params.kelp_large_band:
+                    sell_threshold = base_price + params.kelp_large_sell_offset
      
 
             print(f"position for {product} is {current_pos}, can_buy={can_buy}, can_sell={can_sell}, buy_threshold={buy_threshold}, sell_threshold={sell_threshold}")
             # ------------------------------------------------
             # 1) Check for a good ask to buy
             # ------------------------------------------------
-            if len(order_depth.sell_orders) > 0:
+            if book.best_ask is not None:
                 # The best ask is the LOWEST sell price
-                best_ask, best_ask_amount = list(order_depth.sell_orders.items())[0]
+                best_ask, best_ask_amount = book.best_ask, book.best_ask_volume
 
 
                 # Only buy if best_ask < our acceptable/fair price
@@ -68,9 +207,9 @@ class Trader:
             # ------------------------------------------------
             # 2) Check for a good bid to sell
             # ------------------------------------------------
-            if len(order_depth.buy_orders) > 0:
+            if book.best_bid is not None:
                 # The best bid is the HIGHEST buy price
-                best_bid, best_bid_amount = list(order_depth.buy_orders.items())[0]
+                best_bid, best_bid_amount = book.best_bid, book.best_bid_volume
 
 
                 # Only sell if best_bid > our acceptable/fair price
@@ -87,5 +226,5 @@ class Trader:
         # (Here we are just storing an empty JSON or "SAMPLE", but you can expand as needed)
         traderData = "SAMPLE"
 
-        conversions = 1
+        conversions = self.converter.conversions(state, books)
         return result, conversions, traderData
@@ -0,0 +1,69 @@
+from typing import Any, List, Optional
+
+from datamodel import OrderDepth
+
+# Fair value estimated from the book instead of a hardcoded price.
+#
+# Per tick, from the (at most three) levels on each side:
+#   microprice  best bid and ask weighted by the opposite side's best volume
+#   vwap_mid    midpoint of the volume-weighted bid and volume-weighted ask over all levels
+#   fair        exponentially weighted average of one of the above (``source``)
+# An update touches each level once, so it is O(levels). A one-sided or empty book leaves the
+# estimates at their last values. fairpriceMean.py carries a copy, since the exchange runs the
+# trader file on its own; fairvalue_batch.py computes the same series over a whole price history.
+
+SOURCES = ("microprice", "vwap_mid")
+
+
+def microprice(best_bid: float, bid_volume: float, best_ask: float, ask_volume: float) -> float:
+    return (best_bid * ask_volume + best_ask * bid_volume) / (bid_volume + ask_volume)
+
+
+class FairValue:
+
+    def __init__(self, alpha: float = 0.1, source: str = "vwap_mid") -> None:
+        if source not in SOURCES:
+            raise ValueError(f"source must be one of {SOURCES}, got {source!r}")
+        self.alpha = alpha
+        self.source = source
+        self.microprice: Optional[float] = None
+        self.vwap_mid: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, order_depth: OrderDepth) -> Optional[float]:
+        buy_orders, sell_orders = order_depth.buy_orders, order_depth.sell_orders
+        if buy_orders and sell_orders:
+            best_bid = best_bid_volume = best_ask = best_ask_volume = None
+            bid_notional = bid_volume = 0
+            for price, volume in buy_orders.items():
+                bid_notional += price * volume
+                bid_volume += volume
+                if best_bid is None or price > best_bid:
+                    best_bid, best_bid_volume = price, volume
+            ask_notional = ask_volume = 0
+            for price, volume in sell_orders.items():
+                # Ask volumes are negative in an OrderDepth
+                ask_notional -= price * volume
+                ask_volume -= volume
+                if best_ask is None or price < best_ask:
+                    best_ask, best_ask_volume = price, -volume
+
+            self.microprice = microprice(best_bid, best_bid_volume, best_ask, best_ask_volume)
+            self.vwap_mid = (bid_notional / bid_volume + ask_notional / ask_volume) / 2
+            estimate = self.microprice if self.source == "microprice" else self.vwap_mid
+            self.value = estimate if self.value is None else self.value + self.alpha * (estimate - self.value)
+
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def to_state(self) -> List[Any]:
+        return [self.alpha, self.source, self.value, self.microprice, self.vwap_mid]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "FairValue":
+        engine = cls(state[0], state[1])
+        engine.value, engine.microprice, engine.vwap_mid = state[2], state[3], state[4]
+        return engine
@@ -0,0 +1,59 @@
+import argparse
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from fairvalue import SOURCES, microprice
+from tickstore import open_store
+
+# fairvalue.FairValue over a whole price history at once, as arrays. Research only: traders use
+# the incremental FairValue, which needs neither numpy nor pandas.
+
+
+def batch(columns: Dict[str, np.ndarray], alpha: float = 0.1, source: str = "vwap_mid") -> Dict[str, np.ndarray]:
+    """microprice, vwap_mid and fair for every row of a product's price columns (tick store
+    layout, positive ask volumes). Rows without both sides carry the previous values forward,
+    matching FairValue.update."""
+    if source not in SOURCES:
+        raise ValueError(f"source must be one of {SOURCES}, got {source!r}")
+    sides = {}
+    for side in ("bid", "ask"):
+        prices = np.stack([np.asarray(columns[f"{side}_price_{level}"], dtype=np.float64) for level in (1, 2, 3)])
+        volumes = np.stack([np.asarray(columns[f"{side}_volume_{level}"], dtype=np.float64) for level in (1, 2, 3)])
+        present = ~np.isnan(prices)
+        volume = np.where(present, volumes, 0.0).sum(axis=0)
+        notional = np.where(present, prices * volumes, 0.0).sum(axis=0)
+        sides[side] = (prices[0], volumes[0], notional, volume)
+
+    best_bid, best_bid_volume, bid_notional, bid_volume = sides["bid"]
+    best_ask, best_ask_volume, ask_notional, ask_volume = sides["ask"]
+    # Level 1 is the best level in the files, and is present whenever the side is
+    two_sided = ~np.isnan(best_bid) & ~np.isnan(best_ask)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        micro = np.where(two_sided, microprice(best_bid, best_bid_volume, best_ask, best_ask_volume), np.nan)
+        vwap_mid = np.where(two_sided, (bid_notional / bid_volume + ask_notional / ask_volume) / 2, np.nan)
+
+    micro = pd.Series(micro).ffill()
+    vwap_mid = pd.Series(vwap_mid).ffill()
+    estimate = micro if source == "microprice" else vwap_mid
+    fair = estimate.ewm(alpha=alpha, adjust=False).mean()
+    return {"microprice": micro.to_numpy(), "vwap_mid": vwap_mid.to_numpy(), "fair": fair.to_numpy()}
+
+
+def batch_csv(csv_path: str, alpha: float = 0.1, source: str = "vwap_mid") -> Dict[str, Dict[str, np.ndarray]]:
+    store = open_store(csv_path)
+    return {product: batch(store.product(product), alpha, source) for product in store.products}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Book-derived fair values over a prices CSV.")
+    parser.add_argument("prices", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--alpha", type=float, default=0.1)
+    parser.add_argument("--source", choices=SOURCES, default="vwap_mid")
+    args = parser.parse_args()
+
+    for product, series in batch_csv(args.prices, args.alpha, args.source).items():
+        fair = series["fair"]
+        print(f"{product}: fair last={fair[-1]:.2f} mean={np.nanmean(fair):.2f} min={np.nanmin(fair):.2f} max={np.nanmax(fair):.2f} "
+              f"microprice mean={np.nanmean(series['microprice']):.2f} vwap_mid mean={np.nanmean(series['vwap_mid']):.2f}")
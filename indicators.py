@@ -0,0 +1,173 @@
+import math
+from collections import deque
+from typing import Any, List, Optional
+
+# Incremental indicators for use inside Trader.run. Every update is O(1) and every indicator
+# round-trips through a flat list (to_state/from_state) that is cheap to keep in traderData.
+
+
+class SMA:
+    """Simple moving average over the last ``window`` values, kept as a ring buffer plus a
+    running sum. The sum is recomputed once per wrap so float error cannot accumulate."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: List[float] = []
+        self.head = 0
+        self.total = 0.0
+
+    def update(self, value: float) -> float:
+        if len(self.values) < self.window:
+            self.values.append(value)
+            self.total += value
+        else:
+            self.total += value - self.values[self.head]
+            self.values[self.head] = value
+            self.head += 1
+            if self.head == self.window:
+                self.head = 0
+                self.total = sum(self.values)
+
+        return self.total / len(self.values)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.total / len(self.values) if self.values else None
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    def oldest(self) -> float:
+        return self.values[self.head] if self.ready else self.values[0]
+
+    def to_state(self) -> List[Any]:
+        return [self.window, self.head, self.total, self.values]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "SMA":
+        indicator = cls(state[0])
+        indicator.head = state[1]
+        indicator.total = state[2]
+        indicator.values = state[3]
+        return indicator
+
+
+class EMA:
+    """Exponential moving average; ``alpha`` defaults to 2 / (span + 1)."""
+
+    def __init__(self, span: int, alpha: Optional[float] = None) -> None:
+        self.span = span
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def to_state(self) -> List[Any]:
+        return [self.span, self.alpha, self.value]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "EMA":
+        indicator = cls(state[0], state[1])
+        indicator.value = state[2]
+        return indicator
+
+
+class RollingVariance(SMA):
+    """Windowed mean and (population) variance from running sums of values and squares."""
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        self.total_sq = 0.0
+
+    def update(self, value: float) -> float:
+        if len(self.values) < self.window:
+            self.total_sq += value * value
+        else:
+            old = self.values[self.head]
+            self.total_sq += value * value - old * old
+        mean = super().update(value)
+        if self.head == 0 and self.ready:
+            self.total_sq = sum(v * v for v in self.values)
+        return mean
+
+    @property
+    def variance(self) -> float:
+        n = len(self.values)
+        if n == 0:
+            return 0.0
+        mean = self.total / n
+        return max(0.0, self.total_sq / n - mean * mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def zscore(self, value: float) -> float:
+        std = self.std
+        return (value - self.total / len(self.values)) / std if std > 0 else 0.0
+
+    def to_state(self) -> List[Any]:
+        return [self.window, self.head, self.total, self.values, self.total_sq]
+
+    @classmethod
+    def from_state(cls, state: List[Any]) -> "RollingVariance":
+        indicator = super().from_state(state)
+        indicator.total_sq = state[4]
+        return indicator
+
+
+class RollingMax:
+    """Windowed maximum via a monotonic deque of (index, value); amortised O(1) per update."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.count = 0
+        self.candidates = deque()
+
+    def dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+    def update(self, value: float) -> float:
+        candidates = self.candidates
+        while candidates and self.dominates(value, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((self.count, value))
+        self.count += 1
+        if candidates[0][0] <= self.count - 1 - self.window:
+            candidates.popleft()
+        return candidates[0][1]
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.candidates[0][1] if self.candidates else None
+
+    def to_state(self) -> List[Any]:
+        flat = []
+        for index, value in self.candidates:
+            flat.append(index)
+            flat.append(value)
+        return [self.window, self.count, flat]
+
+    @classmethod
+    def from_state(cls, state: List[Any]):
+        indicator = cls(state[0])
+        indicator.count = state[1]
+        flat = state[2]
+        indicator.candidates = deque((flat[i], flat[i + 1]) for i in range(0, len(flat), 2))
+        return indicator
+
+
+class RollingMin(RollingMax):
+
+    def dominates(self, new: float, old: float) -> bool:
+        return new <= old
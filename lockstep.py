@@ -0,0 +1,65 @@
+import argparse
+import importlib
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+from backtester import Backtester, BacktestResult, read_snapshots, run_lockstep
+from matching import POSITION_LIMIT
+from sweep import PARAMS_CLASSES
+
+# Several Trader variants over one decoded tick stream.
+#
+# A variant is "module" or "module name=value name=value ..." with JSON values, e.g.
+#   python lockstep.py fairpriceMean fairpriceMean2 "fairpriceMean kelp_fair_alpha=0.1"
+# The prices file is parsed once and every snapshot is fed to all variants in turn, each with
+# its own traderData, position and fills. Results are printed side by side.
+
+
+def parse_variant(spec: str) -> Tuple[str, Dict[str, Any]]:
+    module, *assignments = spec.split()
+    overrides = {}
+    for assignment in assignments:
+        name, value = assignment.split("=", 1)
+        overrides[name] = json.loads(value)
+    return module, overrides
+
+
+def make_trader(module_name: str, overrides: Dict[str, Any]):
+    module = importlib.import_module(module_name)
+    if not overrides:
+        return module.Trader()
+    return module.Trader(getattr(module, PARAMS_CLASSES[module_name])(**overrides))
+
+
+def side_by_side(names: List[str], results: List[BacktestResult]) -> str:
+    products = sorted({product for result in results for product in result.pnl})
+    rows = [["", *names]]
+    for product in products:
+        rows.append([product, *(f"{result.pnl.get(product, 0.0):.2f}" for result in results)])
+    rows.append(["Total", *(f"{result.total_pnl:.2f}" for result in results)])
+    rows.append(["Max drawdown", *(f"{result.max_drawdown:.2f}" for result in results)])
+    rows.append(["Fills", *(str(result.fill_count) for result in results)])
+    rows.append(["Ticks", *(str(result.tick_count) for result in results)])
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))) for row in rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay several Trader variants in lockstep over one prices CSV.")
+    parser.add_argument("variants", nargs="+", help='"module" or "module name=value ..." (values are JSON)')
+    parser.add_argument("--prices", default="TutorialData.csv")
+    parser.add_argument("--limit", type=int, default=POSITION_LIMIT)
+    args = parser.parse_args()
+
+    backtesters = []
+    for spec in args.variants:
+        module, overrides = parse_variant(spec)
+        backtesters.append(Backtester(make_trader(module, overrides), args.limit))
+
+    started = time.perf_counter()
+    results = run_lockstep(backtesters, read_snapshots(args.prices))
+    elapsed = time.perf_counter() - started
+    print(side_by_side(args.variants, results))
+    print(f"{len(backtesters)} variants in {elapsed:.2f}s")
@@ -0,0 +1,143 @@
+import argparse
+import json
+from array import array
+from typing import Dict, Iterator, List, TextIO
+
+import numpy as np
+
+# Reads Logger.flush output back into columns.
+#
+# Every tick flush prints one line:
+#   [[timestamp, traderData, listings, order_depths, own_trades, market_trades, position, observations],
+#    orders, conversions, traderData, logs]
+# Lines are parsed one at a time and appended to per-product column buffers (array('d') for
+# numbers), so memory grows with the number of values kept rather than the size of the log.
+# Anything that is not a flush line (summaries, stray prints) is skipped.
+
+BOOK_COLUMNS = [
+    "timestamp",
+    "bid_price_1", "bid_volume_1", "bid_price_2", "bid_volume_2", "bid_price_3", "bid_volume_3",
+    "ask_price_1", "ask_volume_1", "ask_price_2", "ask_volume_2", "ask_price_3", "ask_volume_3",
+    "position",
+]
+TRADE_COLUMNS = ["timestamp", "price", "quantity"]
+ORDER_COLUMNS = ["timestamp", "price", "quantity"]
+NAN = float("nan")
+
+
+def flush_lines(f: TextIO) -> Iterator[list]:
+    for line in f:
+        if not line.startswith("[["):
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+class _Table:
+    """Numeric columns in array('d') plus optional string columns."""
+
+    def __init__(self, numeric: List[str], text: List[str] = ()) -> None:
+        self.numeric = {name: array("d") for name in numeric}
+        self.text: Dict[str, List[str]] = {name: [] for name in text}
+
+    def append(self, values: List[float], texts: List[str] = ()) -> None:
+        for column, value in zip(self.numeric.values(), values):
+            column.append(value)
+        for column, value in zip(self.text.values(), texts):
+            column.append(value)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        result = {name: np.frombuffer(column, dtype=np.float64).copy() for name, column in self.numeric.items()}
+        for name, column in self.text.items():
+            result[name] = np.array(column, dtype=str)
+        return result
+
+
+class LogColumns:
+
+    def __init__(self) -> None:
+        self.books: Dict[str, _Table] = {}
+        self.own_trades: Dict[str, _Table] = {}
+        self.market_trades: Dict[str, _Table] = {}
+        self.orders: Dict[str, _Table] = {}
+        self.ticks = _Table(["timestamp", "conversions", "trader_data_length", "logs_length"])
+
+    def add(self, entry: list) -> None:
+        state, orders, conversions, trader_data, logs = entry
+        timestamp, _, _, order_depths, own_trades, market_trades, position, _ = state
+
+        self.ticks.append([timestamp, conversions, len(trader_data), len(logs)])
+        for symbol, (buy_orders, sell_orders) in order_depths.items():
+            row = [timestamp]
+            bids = sorted(((int(price), volume) for price, volume in buy_orders.items()), reverse=True)
+            asks = sorted((int(price), -volume) for price, volume in sell_orders.items())
+            for levels in (bids, asks):
+                for level in range(3):
+                    if level < len(levels):
+                        row.extend(levels[level])
+                    else:
+                        row.extend((NAN, NAN))
+            row.append(position.get(symbol, 0))
+            self._table(self.books, symbol, BOOK_COLUMNS).append(row)
+
+        for tables, trades in ((self.own_trades, own_trades), (self.market_trades, market_trades)):
+            for symbol, price, quantity, buyer, seller, trade_timestamp in trades:
+                self._table(tables, symbol, TRADE_COLUMNS, ["buyer", "seller"]).append([trade_timestamp, price, quantity], [buyer or "", seller or ""])
+
+        for symbol, price, quantity in orders:
+            self._table(self.orders, symbol, ORDER_COLUMNS).append([timestamp, price, quantity])
+
+    def _table(self, tables: Dict[str, _Table], symbol: str, numeric: List[str], text: List[str] = ()) -> _Table:
+        table = tables.get(symbol)
+        if table is None:
+            table = tables[symbol] = _Table(numeric, text)
+        return table
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Flat "<group>/<symbol>/<column>" mapping (ticks use "ticks/<column>")."""
+        result = {f"ticks/{name}": values for name, values in self.ticks.arrays().items()}
+        for group, tables in (("book", self.books), ("own_trades", self.own_trades), ("market_trades", self.market_trades), ("orders", self.orders)):
+            for symbol, table in tables.items():
+                for name, values in table.arrays().items():
+                    result[f"{group}/{symbol}/{name}"] = values
+        return result
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, **self.to_arrays())
+
+
+def read_log(path: str) -> LogColumns:
+    columns = LogColumns()
+    with open(path) as f:
+        for entry in flush_lines(f):
+            columns.add(entry)
+    return columns
+
+
+def load(path: str) -> Dict[str, Dict[str, Dict[str, np.ndarray]]]:
+    """Load a saved file as {group: {symbol: {column: array}}} (ticks as {"ticks": {"": ...}})."""
+    result: Dict[str, Dict[str, Dict[str, np.ndarray]]] = {}
+    with np.load(path) as data:
+        for key in data.files:
+            parts = key.split("/")
+            group, symbol, name = (parts[0], "", parts[1]) if len(parts) == 2 else parts
+            result.setdefault(group, {}).setdefault(symbol, {})[name] = data[key]
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Turn Logger.flush output into columnar arrays.")
+    parser.add_argument("log", help="file of flush lines, e.g. the stdout of backtester.py --verbose")
+    parser.add_argument("--out", help="write a compressed .npz (default: <log>.npz)")
+    args = parser.parse_args()
+
+    columns = read_log(args.log)
+    out = args.out or args.log + ".npz"
+    columns.save(out)
+    print(f"{len(columns.ticks.numeric['timestamp'])} ticks -> {out}")
+    for symbol, table in columns.books.items():
+        print(f"{symbol}: {len(table.numeric['timestamp'])} book rows, "
+              f"{len(columns.orders[symbol].numeric['timestamp']) if symbol in columns.orders else 0} orders, "
+              f"{len(columns.own_trades[symbol].numeric['timestamp']) if symbol in columns.own_trades else 0} own trades")
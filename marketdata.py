@@ -0,0 +1,126 @@
+import argparse
+import glob
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from backtester import Snapshot, order_depth_from_levels
+from compactmodel import Trade
+from tickstore import PRICE_COLUMNS
+
+# Multi-day market data read in fixed-size chunks.
+#
+# A round ships one prices file and one trades file per day, e.g.
+#   prices_round_1_day_-2.csv   day;timestamp;product;bid_price_1;...;mid_price;profit_and_loss
+#   trades_round_1_day_-2.csv   timestamp;buyer;seller;symbol;currency;price;quantity
+# Trades files have no day column, so their day comes from the file name. Files are read with
+# pandas in chunks of ``chunksize`` rows with fixed dtypes, and price rows and trades are merged
+# on (day, timestamp) into Snapshots. Only one chunk of each file and the snapshot being built
+# are held in memory at a time, however many days are read.
+
+CHUNKSIZE = 50_000
+
+PRICE_DTYPES = {"day": "int64", "timestamp": "int64", "product": "str", **{column: "float64" for column in PRICE_COLUMNS}}
+TRADE_DTYPES = {"timestamp": "int64", "buyer": "str", "seller": "str", "symbol": "str", "currency": "str", "price": "float64", "quantity": "int64"}
+
+_DAY = re.compile(r"day_(-?\d+)")
+
+
+def day_from_filename(path: str) -> Optional[int]:
+    match = _DAY.search(os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+
+def discover(directory: str) -> Tuple[List[str], List[str]]:
+    """prices_*.csv and trades_*.csv files in ``directory``, each sorted by day."""
+    prices = sorted(glob.glob(os.path.join(directory, "prices_*.csv")), key=lambda path: day_from_filename(path) or 0)
+    trades = sorted(glob.glob(os.path.join(directory, "trades_*.csv")), key=lambda path: day_from_filename(path) or 0)
+    return prices, trades
+
+
+def price_rows(paths: Iterable[str], chunksize: int = CHUNKSIZE, delimiter: str = ";") -> Iterator[tuple]:
+    """(day, timestamp, product, bid_price_1, ..., profit_and_loss) rows, NaN for missing values."""
+    for path in paths:
+        for chunk in pd.read_csv(path, sep=delimiter, dtype=PRICE_DTYPES, chunksize=chunksize):
+            columns = [chunk[name].tolist() for name in ["day", "timestamp", "product"] + PRICE_COLUMNS]
+            yield from zip(*columns)
+
+
+def trade_rows(paths: Iterable[str], chunksize: int = CHUNKSIZE, delimiter: str = ";") -> Iterator[Tuple[int, int, Trade]]:
+    """(day, timestamp, Trade) for every market trade. The day is the file's ``day`` column if
+    it has one, otherwise the day in its name."""
+    for path in paths:
+        file_day = day_from_filename(path)
+        for chunk in pd.read_csv(path, sep=delimiter, dtype={**TRADE_DTYPES, "day": "int64"}, chunksize=chunksize, keep_default_na=False, na_values={"price": [""], "quantity": [""]}):
+            if "day" in chunk:
+                days = chunk["day"].tolist()
+            elif file_day is not None:
+                days = [file_day] * len(chunk)
+            else:
+                raise ValueError(f"{path}: no day column and no day_<n> in the file name")
+            rows = zip(days, chunk["timestamp"].tolist(), chunk["symbol"].tolist(), chunk["price"].tolist(), chunk["quantity"].tolist(), chunk["buyer"].tolist(), chunk["seller"].tolist())
+            for day, timestamp, symbol, price, quantity, buyer, seller in rows:
+                yield day, timestamp, Trade(symbol, int(price), quantity, buyer, seller, timestamp)
+
+
+def iter_snapshots(prices: Iterable[str], trades: Iterable[str] = (), chunksize: int = CHUNKSIZE, delimiter: str = ";") -> Iterator[Snapshot]:
+    """One Snapshot per (day, timestamp) of the prices files, in file order, with the market
+    trades up to and including that timestamp attached. Files must be given in day order and be
+    sorted by timestamp within a day, as the exchange writes them. Trades after the last price
+    row of a day are attached to that day's last snapshot."""
+    trade_stream = trade_rows(trades, chunksize, delimiter)
+    next_trade = next(trade_stream, None)
+
+    def attach(snapshot: Snapshot, until_day: int, until_timestamp: Optional[int]) -> None:
+        # Pull every trade up to (until_day, until_timestamp); None means the rest of the day
+        nonlocal next_trade
+        while next_trade is not None:
+            day, timestamp, trade = next_trade
+            if day > until_day or (day == until_day and until_timestamp is not None and timestamp > until_timestamp):
+                break
+            if day == until_day:
+                snapshot.market_trades.setdefault(trade.symbol, []).append(trade)
+            next_trade = next(trade_stream, None)
+
+    snapshot = None
+    for row in price_rows(prices, chunksize, delimiter):
+        day, timestamp = row[0], row[1]
+        if snapshot is None or snapshot.timestamp != timestamp or snapshot.day != day:
+            if snapshot is not None:
+                if day != snapshot.day:
+                    attach(snapshot, snapshot.day, None)
+                yield snapshot
+            snapshot = Snapshot(day, timestamp, {}, {})
+            attach(snapshot, day, timestamp)
+
+        product = row[2]
+        snapshot.order_depths[product] = order_depth_from_levels(row[3:15])
+        mid = row[15]
+        if mid == mid:
+            snapshot.mid_prices[product] = mid
+
+    if snapshot is not None:
+        attach(snapshot, snapshot.day, None)
+        yield snapshot
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream snapshots from a set of day files and report per-day counts.")
+    parser.add_argument("paths", nargs="*", default=["TutorialData.csv"], help="prices files, or a directory of prices_*/trades_* files")
+    parser.add_argument("--trades", action="append", default=[], help="trades file (repeatable)")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+
+    prices, trades = list(args.paths), list(args.trades)
+    if len(prices) == 1 and os.path.isdir(prices[0]):
+        prices, trades = discover(prices[0])
+
+    days: Dict[int, List[int]] = {}
+    for snapshot in iter_snapshots(prices, trades, args.chunksize):
+        counts = days.setdefault(snapshot.day, [0, 0])
+        counts[0] += 1
+        counts[1] += sum(len(day_trades) for day_trades in snapshot.market_trades.values())
+    for day, (snapshots, trade_count) in days.items():
+        print(f"day {day}: {snapshots} snapshots, {trade_count} market trades")
@@ -0,0 +1,177 @@
+import heapq
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from compactmodel import Order, Trade
+from datamodel import OrderDepth, Symbol
+
+# Both traders hardcode a +-50 limit for every product
+POSITION_LIMIT = 50
+SUBMISSION = "SUBMISSION"
+
+
+class BookSide:
+    """One side of a price-level book.
+
+    Prices live in a heap (negated for bids) so inserting a new level is O(log n) and the best
+    price is at index 0. Emptied levels are dropped lazily, the next time they reach the top.
+    Each level keeps a FIFO queue of [owner, quantity] entries for time priority.
+    """
+
+    def __init__(self, is_bid: bool) -> None:
+        self.is_bid = is_bid
+        self._heap: List[int] = []
+        self._levels: Dict[int, Deque[List]] = {}
+        self._volume: Dict[int, int] = {}
+
+    def add(self, price: int, quantity: int, owner: str = "") -> None:
+        if quantity <= 0:
+            return
+        level = self._levels.get(price)
+        if level is None:
+            level = self._levels[price] = deque()
+            self._volume[price] = 0
+            heapq.heappush(self._heap, -price if self.is_bid else price)
+        level.append([owner, quantity])
+        self._volume[price] += quantity
+
+    def best(self) -> Optional[int]:
+        heap = self._heap
+        while heap:
+            price = -heap[0] if self.is_bid else heap[0]
+            if price in self._levels:
+                return price
+            heapq.heappop(heap)
+        return None
+
+    def volume(self, price: int) -> int:
+        return self._volume.get(price, 0)
+
+    def crosses(self, price: int, limit_price: int) -> bool:
+        return price >= limit_price if self.is_bid else price <= limit_price
+
+    def take(self, quantity: int, limit_price: int) -> List[Tuple[int, int, str]]:
+        """Consume up to ``quantity`` from the best levels that cross ``limit_price``.
+        Returns (price, quantity, owner) fills; partially filled entries stay at the front."""
+        fills = []
+        while quantity > 0:
+            price = self.best()
+            if price is None or not self.crosses(price, limit_price):
+                break
+
+            level = self._levels[price]
+            while quantity > 0 and level:
+                entry = level[0]
+                volume = min(quantity, entry[1])
+                entry[1] -= volume
+                quantity -= volume
+                self._volume[price] -= volume
+                fills.append((price, volume, entry[0]))
+                if entry[1] == 0:
+                    level.popleft()
+
+            if not level:
+                del self._levels[price]
+                del self._volume[price]
+                heapq.heappop(self._heap)
+
+        return fills
+
+    def levels(self) -> List[Tuple[int, int]]:
+        return sorted(self._volume.items(), reverse=self.is_bid)
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+
+def within_limit(orders: List[Order], position: int, limit: int = POSITION_LIMIT) -> bool:
+    """The exchange rejects every order for a product if executing all of its buys (or all of
+    its sells) in full would take the position past the limit."""
+    total_buy = 0
+    total_sell = 0
+    for order in orders:
+        if order.quantity > 0:
+            total_buy += order.quantity
+        else:
+            total_sell -= order.quantity
+
+    return position + total_buy <= limit and position - total_sell >= -limit
+
+
+class MatchingEngine:
+    """Matches a product's orders for one tick against the visible book."""
+
+    def __init__(self, symbol: Symbol, position_limit: int = POSITION_LIMIT) -> None:
+        self.symbol = symbol
+        self.position_limit = position_limit
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+
+    @classmethod
+    def from_order_depth(cls, symbol: Symbol, order_depth: OrderDepth, position_limit: int = POSITION_LIMIT) -> "MatchingEngine":
+        engine = cls(symbol, position_limit)
+        for price, volume in order_depth.buy_orders.items():
+            engine.bids.add(price, volume)
+        for price, volume in order_depth.sell_orders.items():
+            engine.asks.add(price, -volume)
+
+        return engine
+
+    def submit(self, orders: List[Order], position: int, timestamp: int) -> Tuple[List[Trade], List[Order]]:
+        """Match orders against the book in submission order.
+
+        Returns the fills and the unfilled remainders (which the caller may match against
+        market trades). Nothing fills if the orders could breach the position limit.
+        """
+        if not within_limit(orders, position, self.position_limit):
+            return [], []
+
+        trades = []
+        remaining = []
+        for order in orders:
+            if order.quantity > 0:
+                fills = self.asks.take(order.quantity, order.price)
+                for price, volume, owner in fills:
+                    trades.append(Trade(self.symbol, price, volume, SUBMISSION, owner, timestamp))
+                left = order.quantity - sum(fill[1] for fill in fills)
+            elif order.quantity < 0:
+                fills = self.bids.take(-order.quantity, order.price)
+                for price, volume, owner in fills:
+                    trades.append(Trade(self.symbol, price, volume, owner, SUBMISSION, timestamp))
+                left = order.quantity + sum(fill[1] for fill in fills)
+            else:
+                left = 0
+
+            if left != 0:
+                remaining.append(Order(order.symbol, order.price, left))
+
+        return trades, remaining
+
+
+def match_market_trades(orders: List[Order], market_trades: List[Trade], timestamp: int) -> List[Trade]:
+    """Fill resting orders against market trades that printed through their price.
+
+    A buy fills at its own price against trades at or below it, a sell against trades at or
+    above it; each market trade's quantity is shared out in order. Inputs are not mutated.
+    """
+    available = [trade.quantity for trade in market_trades]
+    fills = []
+    for order in orders:
+        left = abs(order.quantity)
+        for i, trade in enumerate(market_trades):
+            if left == 0:
+                break
+            if available[i] == 0:
+                continue
+            if order.quantity > 0 and trade.price <= order.price:
+                volume = min(left, available[i])
+                fills.append(Trade(order.symbol, order.price, volume, SUBMISSION, trade.seller or "", timestamp))
+            elif order.quantity < 0 and trade.price >= order.price:
+                volume = min(left, available[i])
+                fills.append(Trade(order.symbol, order.price, volume, trade.buyer or "", SUBMISSION, timestamp))
+            else:
+                continue
+            available[i] -= volume
+            left -= volume
+
+    return fills
@@ -0,0 +1,65 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+from datamodel import OrderDepth
+
+
+class BookView:
+    """Read-only, price-sorted view of an OrderDepth, built once per product per tick.
+
+    Volumes keep the OrderDepth sign convention (asks are negative). Best prices, spread and
+    mid are computed up front; "first level beyond X" lookups are bisects over sorted prices.
+    """
+
+    __slots__ = ("order_depth", "bid_prices", "ask_prices", "best_bid", "best_ask", "best_bid_volume", "best_ask_volume")
+
+    def __init__(self, order_depth: OrderDepth) -> None:
+        self.order_depth = order_depth
+        # Both ascending so bisect works the same way on each side
+        self.bid_prices: List[int] = sorted(order_depth.buy_orders)
+        self.ask_prices: List[int] = sorted(order_depth.sell_orders)
+
+        self.best_bid: Optional[int] = self.bid_prices[-1] if self.bid_prices else None
+        self.best_ask: Optional[int] = self.ask_prices[0] if self.ask_prices else None
+        self.best_bid_volume = order_depth.buy_orders[self.best_bid] if self.best_bid is not None else 0
+        self.best_ask_volume = order_depth.sell_orders[self.best_ask] if self.best_ask is not None else 0
+
+    @property
+    def spread(self) -> Optional[int]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    @property
+    def mid(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_ask + self.best_bid) / 2
+
+    def bids(self) -> List[Tuple[int, int]]:
+        """Bid levels, best (highest) first."""
+        buy_orders = self.order_depth.buy_orders
+        return [(price, buy_orders[price]) for price in reversed(self.bid_prices)]
+
+    def asks(self) -> List[Tuple[int, int]]:
+        """Ask levels, best (lowest) first."""
+        sell_orders = self.order_depth.sell_orders
+        return [(price, sell_orders[price]) for price in self.ask_prices]
+
+    def first_ask_above(self, price: float) -> Optional[int]:
+        i = bisect_right(self.ask_prices, price)
+        return self.ask_prices[i] if i < len(self.ask_prices) else None
+
+    def first_bid_below(self, price: float) -> Optional[int]:
+        i = bisect_left(self.bid_prices, price)
+        return self.bid_prices[i - 1] if i > 0 else None
+
+    def ask_volume_at_or_below(self, price: float) -> int:
+        """Total (positive) ask volume that a buy at ``price`` could take."""
+        sell_orders = self.order_depth.sell_orders
+        return -sum(sell_orders[p] for p in self.ask_prices[: bisect_right(self.ask_prices, price)])
+
+    def bid_volume_at_or_above(self, price: float) -> int:
+        """Total bid volume that a sell at ``price`` could take."""
+        buy_orders = self.order_depth.buy_orders
+        return sum(buy_orders[p] for p in self.bid_prices[bisect_left(self.bid_prices, price):])
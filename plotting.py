@@ -0,0 +1,159 @@
+import argparse
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from analytics import ProductStats, analyze
+
+# Headless plotting for long tick histories.
+#
+# Series are downsampled to roughly two points per horizontal pixel before they reach
+# matplotlib, so drawing cost depends on figure width rather than history length. Figures are
+# built with the object-oriented API on an Agg canvas; pyplot and a display are never needed.
+
+DEFAULT_WIDTH_PX = 1600
+DEFAULT_DPI = 100
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the minimum and maximum of each of ``buckets`` equal-width chunks, in x order.
+    Every spike survives, which is what a line plot at this resolution would show anyway."""
+    n = len(y)
+    if n <= 2 * buckets:
+        return x, y
+
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    chunks = padded.reshape(buckets, size)
+    valid = ~np.isnan(chunks).all(axis=1)
+    low = np.argmin(np.where(np.isnan(chunks), np.inf, chunks), axis=1)
+    high = np.argmax(np.where(np.isnan(chunks), -np.inf, chunks), axis=1)
+
+    offsets = np.arange(buckets) * size
+    first = np.minimum(low, high)[valid] + offsets[valid]
+    second = np.maximum(low, high)[valid] + offsets[valid]
+    index = np.stack([first, second], axis=1).ravel()
+    index = index[np.concatenate(([True], np.diff(index) != 0))]
+    return x[index], y[index]
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets: ``threshold`` points that keep the visual shape of the
+    line. NaNs are dropped first."""
+    keep = ~np.isnan(y)
+    x = np.asarray(x, dtype=np.float64)[keep]
+    y = np.asarray(y, dtype=np.float64)[keep]
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle corner
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs((x[previous] - next_x) * (bucket_y - y[previous]) - (x[previous] - bucket_x) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return x[selected], y[selected]
+
+
+def downsample(x: np.ndarray, y: np.ndarray, width_px: int, method: str = "minmax") -> Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if method == "lttb":
+        return lttb_downsample(x, y, 2 * width_px)
+    return minmax_downsample(x, y, width_px)
+
+
+def new_figure(width_px: int, height_px: int, dpi: int = DEFAULT_DPI) -> Figure:
+    figure = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def plot_product(stats: ProductStats, windows: Iterable[int], width_px: int = DEFAULT_WIDTH_PX, method: str = "minmax") -> Figure:
+    """Mid price with SMAs and crossovers, the differenced mid, and the spread histogram."""
+    windows = sorted(windows)
+    mid = stats["mid_price"]
+    index = np.arange(len(mid))
+
+    figure = new_figure(width_px, 900)
+    price_axes, diff_axes, spread_axes = figure.subplots(3, 1, gridspec_kw={"height_ratios": [3, 1, 1]})
+
+    price_axes.plot(*downsample(index, mid, width_px, method), label="Mid Price", color="black", linewidth=0.8)
+    colors = ["blue", "red", "orange", "purple"]
+    for window, color in zip(windows, colors):
+        price_axes.plot(*downsample(index, stats[f"sma_{window}"], width_px, method), label=f"SMA{window}", color=color, linewidth=0.8)
+    if len(windows) >= 2:
+        crossovers = np.asarray(stats.crossovers(windows[0], windows[-1]), dtype=np.int64)
+        # Crossovers are markers, not a line: thin them to at most one per pixel
+        if len(crossovers) > width_px:
+            crossovers = crossovers[np.linspace(0, len(crossovers) - 1, width_px).astype(np.int64)]
+        price_axes.scatter(crossovers, mid[crossovers], label="Crossover", color="green", marker="o", s=20)
+    price_axes.set_title(f"Mid price of {stats.product}")
+    price_axes.set_ylabel("Price")
+    price_axes.legend(loc="upper left")
+    price_axes.grid(True)
+
+    diff_axes.plot(*downsample(index, stats["mid_diff"], width_px, method), color="black", linewidth=0.6)
+    diff_axes.set_title("Differenced mid price")
+    diff_axes.set_ylabel("Difference")
+
+    spread = stats["spread"]
+    spread = spread[~np.isnan(spread)]
+    if len(spread):
+        values, counts = np.unique(spread, return_counts=True)
+        spread_axes.bar(values, counts, width=0.8)
+    spread_axes.set_title("Spread distribution")
+    spread_axes.set_xlabel("Spread")
+
+    figure.tight_layout()
+    return figure
+
+
+def render_report(csv_path: str, out_dir: str, windows: Iterable[int] = (30, 100), formats: Iterable[str] = ("png",), width_px: int = DEFAULT_WIDTH_PX, method: str = "minmax", products: Optional[Iterable[str]] = None) -> Dict[str, list]:
+    """Write one figure per product and format into ``out_dir``; returns product -> paths."""
+    windows = tuple(windows)
+    stats = analyze(csv_path, windows=windows)
+    os.makedirs(out_dir, exist_ok=True)
+
+    written = {}
+    for product in products or stats:
+        figure = plot_product(stats[product], windows, width_px, method)
+        written[product] = []
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{product}.{fmt}")
+            figure.savefig(path)
+            written[product].append(path)
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a headless per-product plot report.")
+    parser.add_argument("prices", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--out", default="report")
+    parser.add_argument("--windows", default="30,100")
+    parser.add_argument("--format", action="append", dest="formats", help="png and/or svg (repeatable)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH_PX, help="figure width in pixels")
+    parser.add_argument("--method", choices=("minmax", "lttb"), default="minmax")
+    args = parser.parse_args()
+
+    written = render_report(args.prices, args.out, [int(w) for w in args.windows.split(",")], args.formats or ["png"], args.width, args.method)
+    for product, paths in written.items():
+        print(f"{product}: {', '.join(paths)}")
@@ -0,0 +1,128 @@
+import math
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Opt-in latency instrumentation for Trader.run, applied by the backtester from outside: the
+# whole run call per tick, plus the trader module's codec and logger and computeMA wrapped in
+# place (instrument_trader). The trader file itself never imports this module.
+
+# Exchange wall-clock limit per run call is 900ms; warn well before that by default
+DEFAULT_BUDGET_MS = 500.0
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of nanosecond durations: constant memory, O(1) record, and
+    percentiles accurate to the bucket width (about 6% with 40 buckets per decade)."""
+
+    BUCKETS_PER_DECADE = 40
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        bucket = int(math.log10(ns) * self.BUCKETS_PER_DECADE) if ns > 0 else 0
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding the p-th percentile, in nanoseconds."""
+        if self.count == 0:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(10 ** ((bucket + 1) / self.BUCKETS_PER_DECADE), self.max)
+        return float(self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Profiler:
+
+    def __init__(self, enabled: bool = False, budget_ms: float = DEFAULT_BUDGET_MS) -> None:
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.sections: Dict[str, LatencyHistogram] = {}
+        self.over_budget: List[Tuple[int, float]] = []
+        self._tick_start = 0
+
+    def start(self) -> int:
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def stop(self, section: str, started: int) -> None:
+        if not self.enabled:
+            return
+        elapsed = time.perf_counter_ns() - started
+        histogram = self.sections.get(section)
+        if histogram is None:
+            histogram = self.sections[section] = LatencyHistogram()
+        histogram.record(elapsed)
+
+    def instrument(self, owner: Any, attribute: str, section: Optional[str] = None) -> None:
+        """Replace ``owner.<attribute>`` with a wrapper that times each call under ``section``
+        (default: the attribute name). Set on the instance, so the class is left alone."""
+        fn = getattr(owner, attribute)
+        section = section or attribute
+
+        def timed(*args, **kwargs):
+            started = self.start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.stop(section, started)
+
+        setattr(owner, attribute, timed)
+
+    def begin_tick(self) -> None:
+        if self.enabled:
+            self._tick_start = time.perf_counter_ns()
+
+    def end_tick(self, timestamp: int) -> None:
+        if not self.enabled:
+            return
+        self.stop("tick", self._tick_start)
+        elapsed_ms = (time.perf_counter_ns() - self._tick_start) / 1e6
+        if elapsed_ms > self.budget_ms:
+            self.over_budget.append((timestamp, elapsed_ms))
+            sys.stderr.write(f"WARNING: tick {timestamp} took {elapsed_ms:.1f}ms (budget {self.budget_ms:.0f}ms)\n")
+
+    def reset(self) -> None:
+        self.sections = {}
+        self.over_budget = []
+
+    def report(self) -> str:
+        lines = [f"{'section':<20}{'count':>8}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for name, histogram in sorted(self.sections.items(), key=lambda item: -item[1].total):
+            lines.append(
+                f"{name:<20}{histogram.count:>8}{histogram.mean / 1e3:>10.1f}"
+                f"{histogram.percentile(50) / 1e3:>10.1f}{histogram.percentile(99) / 1e3:>10.1f}{histogram.max / 1e3:>10.1f}"
+            )
+        lines.append(f"ticks over {self.budget_ms:.0f}ms budget: {len(self.over_budget)}")
+        return "\n".join(lines)
+
+
+# Trader-module helpers timed as their own sections under backtester.py --profile, where the
+# module has them: (module attribute, method)
+SECTIONS = (("codec", "decode"), ("codec", "encode"), ("logger", "flush"))
+
+
+def instrument_trader(profiler: Profiler, trader: Any) -> None:
+    """Time the trader's helpers from outside, so the uploaded file carries no profiling code."""
+    module = sys.modules.get(type(trader).__module__)
+    for owner_name, attribute in SECTIONS:
+        owner = getattr(module, owner_name, None)
+        if owner is not None and callable(getattr(owner, attribute, None)):
+            profiler.instrument(owner, attribute)
+    if callable(getattr(trader, "computeMA", None)):
+        profiler.instrument(trader, "computeMA")
@@ -0,0 +1,127 @@
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+
+from backtester import Backtester, Snapshot
+from tickstore import TickStore, open_store
+
+# Parameter object each trader module's Trader(params) accepts
+PARAMS_CLASSES = {
+    "fairpriceMean": "MarketMakerParams",
+    "fairpriceMean2": "ThresholdParams",
+}
+
+# Set once per worker process by _init_worker. The snapshots are built from the memory-mapped
+# store once per worker and reused for every point it evaluates; the backtester only reads them.
+_snapshots: Optional[List[Snapshot]] = None
+_trader_module = None
+_params_class = None
+
+
+def grid(space: Dict[str, List[Any]]) -> Iterator[Dict[str, Any]]:
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_search(space: Dict[str, List[Any]], samples: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Sample ``samples`` points. A [low, high] pair of ints or floats is a range to draw
+    uniformly from; any other list is a set of choices."""
+    rng = random.Random(seed)
+    for _ in range(samples):
+        point = {}
+        for name, values in space.items():
+            # bool is an int subclass, but true,false is a choice, not a range
+            numeric = len(values) == 2 and not any(isinstance(v, bool) for v in values)
+            if numeric and all(isinstance(v, int) for v in values):
+                point[name] = rng.randint(values[0], values[1])
+            elif numeric and all(isinstance(v, (int, float)) for v in values):
+                point[name] = rng.uniform(values[0], values[1])
+            else:
+                point[name] = rng.choice(values)
+        yield point
+
+
+def _init_worker(store_dir: str, trader_module: str) -> None:
+    global _snapshots, _trader_module, _params_class
+    _snapshots = list(TickStore(store_dir).iter_snapshots())
+    _trader_module = importlib.import_module(trader_module)
+    _params_class = getattr(_trader_module, PARAMS_CLASSES[trader_module])
+
+
+def _evaluate(index: int, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    trader = _trader_module.Trader(_params_class(**overrides))
+    result = Backtester(trader).run(_snapshots)
+    row = {"index": index}
+    row.update(overrides)
+    row["total_pnl"] = result.total_pnl
+    for product in sorted(result.pnl):
+        row[f"pnl_{product}"] = result.pnl[product]
+    row["max_drawdown"] = result.max_drawdown
+    row["fills"] = result.fill_count
+    row["ticks"] = result.tick_count
+    return row
+
+
+def run_sweep(trader_module: str, csv_path: str, points: List[Dict[str, Any]], out_path: str, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Backtest every parameter point in a process pool and write one CSV row per point,
+    best total PnL first."""
+    # Convert up front in the parent, so workers only ever open an existing store
+    store_dir = open_store(csv_path).store_dir
+
+    rows = []
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_dir, trader_module)) as pool:
+        futures = [pool.submit(_evaluate, i, point) for i, point in enumerate(points)]
+        for done, future in enumerate(as_completed(futures), 1):
+            rows.append(future.result())
+            if done % 100 == 0 or done == len(futures):
+                print(f"{done}/{len(futures)} done in {time.time() - started:.1f}s")
+
+    rows.sort(key=lambda row: row["total_pnl"], reverse=True)
+    fieldnames = []
+    for row in rows:
+        for name in row:
+            if name not in fieldnames:
+                fieldnames.append(name)
+    with open(out_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({name: json.dumps(value) if isinstance(value, (dict, list)) else value for name, value in row.items()})
+
+    return rows
+
+
+def parse_space(specs: List[str]) -> Dict[str, List[Any]]:
+    # "name=v1,v2,..." where each value is JSON (so 10, 0.5 and {"KELP":2020} all work)
+    space = {}
+    for spec in specs:
+        name, values = spec.split("=", 1)
+        space[name] = json.loads(f"[{values}]")
+    return space
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid or random search over a trader's parameter object.")
+    parser.add_argument("trader", choices=sorted(PARAMS_CLASSES))
+    parser.add_argument("prices", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=V1,V2,...", help="values for a grid, or low,high for --random")
+    parser.add_argument("--random", type=int, metavar="N", help="draw N random points instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    space = parse_space(args.param)
+    points = list(random_search(space, args.random, args.seed) if args.random else grid(space))
+    rows = run_sweep(args.trader, args.prices, points, args.out, args.workers)
+    for row in rows[:10]:
+        print(row)
@@ -0,0 +1,242 @@
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+import numpy as np
+
+from backtester import Snapshot, order_depth_from_levels
+from datamodel import Listing, Observation, TradingState
+from tickstore import COLUMNS, LEVEL_COLUMNS, PRICE_COLUMNS, open_store
+
+# Synthetic order books fitted to a prices CSV, for scale testing.
+#
+# Per product we fit:
+#   - the mid price as mid_t = mid_{t-1} + d_t with d_t = phi * d_{t-1} + kappa * (mean - mid_{t-1}) + noise
+#   - the empirical distribution of the best-level spread
+#   - the empirical distribution of each level's volume and of the price gap between levels
+#   - how often each level is missing on each side
+# and then stream as many days and products as asked for. Output is generated in fixed-size
+# chunks, so memory stays constant however long the stream is.
+
+CHUNK = 1000
+
+
+class Empirical:
+    """Samples from the observed values of a column (NaNs dropped)."""
+
+    def __init__(self, values: np.ndarray, fallback: float = 0.0) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.values, counts = np.unique(values, return_counts=True) if len(values) else (np.array([fallback]), np.array([1]))
+        self.probabilities = counts / counts.sum()
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.choice(self.values, size=size, p=self.probabilities)
+
+
+class ProductModel:
+
+    def __init__(self, product: str, columns: Dict[str, np.ndarray]) -> None:
+        self.product = product
+        mid = np.asarray(columns["mid_price"], dtype=np.float64)
+        mid = mid[~np.isnan(mid)]
+        self.mean = float(mid.mean())
+        self.start = float(mid[0])
+
+        # Least squares for d_t = phi * d_{t-1} + kappa * (mean - mid_{t-1}) + e_t
+        diff = np.diff(mid)
+        if len(diff) > 2:
+            design = np.stack([diff[:-1], self.mean - mid[1:-1]], axis=1)
+            (self.phi, self.kappa), *_ = np.linalg.lstsq(design, diff[1:], rcond=None)
+            self.sigma = float(np.std(diff[1:] - design @ np.array([self.phi, self.kappa])))
+        else:
+            self.phi, self.kappa, self.sigma = 0.0, 0.0, 1.0
+        self.phi = float(np.clip(self.phi, -0.99, 0.99))
+        self.kappa = float(np.clip(self.kappa, 0.0, 1.0))
+
+        self.spread = Empirical(np.asarray(columns["ask_price_1"]) - np.asarray(columns["bid_price_1"]), 2.0)
+        self.volumes: Dict[str, Empirical] = {}
+        self.gaps: Dict[str, Empirical] = {}
+        self.missing: Dict[str, float] = {}
+        for side, sign in (("bid", -1), ("ask", 1)):
+            for level in (1, 2, 3):
+                price = np.asarray(columns[f"{side}_price_{level}"])
+                self.volumes[f"{side}_{level}"] = Empirical(columns[f"{side}_volume_{level}"], 1.0)
+                if level == 1:
+                    self.missing[f"{side}_1"] = float(np.isnan(price).mean())
+                else:
+                    previous = np.asarray(columns[f"{side}_price_{level - 1}"])
+                    present_before = ~np.isnan(previous)
+                    # Probability the level is missing given the one above it is present
+                    self.missing[f"{side}_{level}"] = float(np.isnan(price[present_before]).mean()) if present_before.any() else 1.0
+                    self.gaps[f"{side}_{level}"] = Empirical(sign * (price - previous), 1.0)
+
+    def __repr__(self) -> str:
+        return f"ProductModel({self.product}, mean={self.mean:.2f}, phi={self.phi:.3f}, kappa={self.kappa:.4f}, sigma={self.sigma:.3f})"
+
+
+def fit(csv_path: str) -> List[ProductModel]:
+    store = open_store(csv_path)
+    return [ProductModel(product, store.product(product)) for product in store.products]
+
+
+class _ProductStream:
+    """Generates one product's rows a chunk at a time."""
+
+    def __init__(self, name: str, model: ProductModel, rng: np.random.Generator, offset: float) -> None:
+        self.name = name
+        self.model = model
+        self.rng = rng
+        self.offset = offset
+        self.mid = model.start
+        self.diff = 0.0
+
+    def chunk(self, size: int) -> Dict[str, np.ndarray]:
+        model, rng = self.model, self.rng
+        noise = rng.normal(0.0, model.sigma, size).tolist()
+        fair = [0.0] * size
+        mid, diff = self.mid, self.diff
+        for i in range(size):
+            diff = model.phi * diff + model.kappa * (model.mean - mid) + noise[i]
+            mid += diff
+            fair[i] = mid
+        self.mid, self.diff = mid, diff
+
+        fair = np.array(fair) + self.offset
+        spread = model.spread.sample(rng, size)
+        bid = np.round(fair - spread / 2)
+        ask = bid + spread
+
+        rows = {}
+        for side, sign, best in (("bid", -1, bid), ("ask", 1, ask)):
+            present = rng.random(size) >= model.missing[f"{side}_1"]
+            price = best
+            for level in (1, 2, 3):
+                if level > 1:
+                    present &= rng.random(size) >= model.missing[f"{side}_{level}"]
+                    price = price + sign * model.gaps[f"{side}_{level}"].sample(rng, size)
+                rows[f"{side}_price_{level}"] = np.where(present, price, np.nan)
+                rows[f"{side}_volume_{level}"] = np.where(present, model.volumes[f"{side}_{level}"].sample(rng, size), np.nan)
+
+        bid_1, ask_1 = rows["bid_price_1"], rows["ask_price_1"]
+        rows["mid_price"] = np.where(np.isnan(bid_1), ask_1, np.where(np.isnan(ask_1), bid_1, (bid_1 + ask_1) / 2))
+        rows["profit_and_loss"] = np.zeros(size)
+        return rows
+
+
+class Generator:
+
+    def __init__(self, models: List[ProductModel], products: Optional[int] = None, days: int = 1, ticks_per_day: int = 10000, first_day: int = 0, timestamp_step: int = 100, seed: int = 0) -> None:
+        """``products`` streams beyond the fitted ones reuse the fitted models round-robin,
+        named <product>_<n> and shifted in price so they are distinguishable."""
+        self.days = days
+        self.ticks_per_day = ticks_per_day
+        self.first_day = first_day
+        self.timestamp_step = timestamp_step
+        seeds = np.random.SeedSequence(seed).spawn(products or len(models))
+        self.streams = []
+        for i, child in enumerate(seeds):
+            model = models[i % len(models)]
+            copy = i // len(models)
+            name = model.product if copy == 0 else f"{model.product}_{copy}"
+            self.streams.append(_ProductStream(name, model, np.random.default_rng(child), 10.0 * copy))
+
+    def fair_prices(self) -> Dict[str, int]:
+        """Fitted mean price of every stream, shifted like the stream itself. Traders with fixed
+        fair values (fairpriceMean2 raises KeyError for unknown products) need these for the
+        suffixed products, e.g. as ThresholdParams(acceptable_prices=...)."""
+        return {stream.name: int(round(stream.model.mean + stream.offset)) for stream in self.streams}
+
+    def chunks(self) -> Iterator[tuple]:
+        """(day, timestamps, {product: columns}) blocks of at most CHUNK ticks."""
+        for day in range(self.first_day, self.first_day + self.days):
+            for start in range(0, self.ticks_per_day, CHUNK):
+                size = min(CHUNK, self.ticks_per_day - start)
+                timestamps = (np.arange(start, start + size) * self.timestamp_step).tolist()
+                yield day, timestamps, {stream.name: stream.chunk(size) for stream in self.streams}
+
+    def write_csv(self, out: TextIO) -> int:
+        """Write rows in the prices CSV schema; returns the number of rows."""
+        out.write(";".join(COLUMNS[:2] + ["product"] + PRICE_COLUMNS) + "\n")
+        rows = 0
+        for day, timestamps, products in self.chunks():
+            formatted = {
+                product: [[_format(value, name) for name, value in zip(PRICE_COLUMNS, values)] for values in zip(*(columns[name].tolist() for name in PRICE_COLUMNS))]
+                for product, columns in products.items()
+            }
+            lines = []
+            for i, timestamp in enumerate(timestamps):
+                for product, values in formatted.items():
+                    lines.append(f"{day};{timestamp};{product};" + ";".join(values[i]))
+            out.write("\n".join(lines) + "\n")
+            rows += len(lines)
+        return rows
+
+    def snapshots(self) -> Iterator[Snapshot]:
+        for day, timestamps, products in self.chunks():
+            levels = {product: list(zip(*(data[name].tolist() for name in LEVEL_COLUMNS))) for product, data in products.items()}
+            mids = {product: data["mid_price"].tolist() for product, data in products.items()}
+            for i, timestamp in enumerate(timestamps):
+                snapshot = Snapshot(day, timestamp, {}, {})
+                for product, product_levels in levels.items():
+                    snapshot.order_depths[product] = order_depth_from_levels(product_levels[i])
+                    mid = mids[product][i]
+                    if mid == mid:
+                        snapshot.mid_prices[product] = mid
+                yield snapshot
+
+    def states(self) -> Iterator[TradingState]:
+        for snapshot in self.snapshots():
+            yield TradingState(
+                "",
+                snapshot.timestamp,
+                {product: Listing(product, product, "SEASHELLS") for product in snapshot.order_depths},
+                snapshot.order_depths,
+                {},
+                {},
+                {},
+                Observation({}, {}),
+            )
+
+
+def _format(value: float, column: str) -> str:
+    # Same rendering as the exchange files: prices and volumes as integers, the rest as floats
+    if value != value:
+        return ""
+    if column in ("mid_price", "profit_and_loss"):
+        return str(value)
+    return str(int(value))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream synthetic order books fitted to a prices CSV.")
+    parser.add_argument("prices", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=10000, help="ticks per day")
+    parser.add_argument("--products", type=int, help="number of product streams (default: one per fitted product)")
+    parser.add_argument("--first-day", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="output CSV (default: stdout)")
+    parser.add_argument("--show-models", action="store_true")
+    parser.add_argument("--fair-prices", help="write {product: fair price} JSON for every stream to this file")
+    args = parser.parse_args()
+
+    models = fit(args.prices)
+    if args.show_models:
+        for model in models:
+            print(model, file=sys.stderr)
+
+    generator = Generator(models, args.products, args.days, args.ticks, args.first_day, seed=args.seed)
+    if args.fair_prices:
+        with open(args.fair_prices, "w") as f:
+            json.dump(generator.fair_prices(), f)
+    elif len(generator.streams) > len(models):
+        print("warning: traders with fixed fair prices (fairpriceMean2) fail on the extra products; "
+              "write them with --fair-prices and pass them as acceptable_prices", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w") as f:
+            rows = generator.write_csv(f)
+        print(f"wrote {rows} rows to {args.out}", file=sys.stderr)
+    else:
+        generator.write_csv(sys.stdout)
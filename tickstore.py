@@ -0,0 +1,173 @@
+import argparse
+import csv
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backtester import Snapshot, order_depth_from_levels
+
+# Columns of the prices CSV after day;timestamp;product, in file order
+PRICE_COLUMNS = [
+    "bid_price_1", "bid_volume_1", "bid_price_2", "bid_volume_2", "bid_price_3", "bid_volume_3",
+    "ask_price_1", "ask_volume_1", "ask_price_2", "ask_volume_2", "ask_price_3", "ask_volume_3",
+    "mid_price", "profit_and_loss",
+]
+COLUMNS = ["day", "timestamp"] + PRICE_COLUMNS
+# The twelve bid/ask price and volume columns, in the order order_depth_from_levels takes them
+LEVEL_COLUMNS = PRICE_COLUMNS[:12]
+MANIFEST = "manifest.json"
+VERSION = 1
+
+
+def default_store_dir(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".ticks"
+
+
+def source_stamp(path: str) -> List[float]:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def convert(csv_path: str, store_dir: Optional[str] = None, delimiter: str = ";") -> str:
+    """Convert a prices CSV into <store_dir>/<product>/<column>.npy, one array per column.
+
+    day and timestamp are int64, every other column float64 with NaN where a level is missing.
+    """
+    store_dir = store_dir or default_store_dir(csv_path)
+    columns: Dict[str, List[List[str]]] = {}
+
+    with open(csv_path, newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader)
+        if header[3:] != PRICE_COLUMNS:
+            raise ValueError(f"Unexpected header in {csv_path}: {header}")
+
+        for row in reader:
+            if not row:
+                continue
+            product_rows = columns.get(row[2])
+            if product_rows is None:
+                product_rows = columns[row[2]] = [[] for _ in COLUMNS]
+            product_rows[0].append(row[0])
+            product_rows[1].append(row[1])
+            for i in range(len(PRICE_COLUMNS)):
+                product_rows[i + 2].append(row[i + 3] or "nan")
+
+    manifest = {"version": VERSION, "source": os.path.abspath(csv_path), "source_stamp": source_stamp(csv_path), "products": {}}
+    for product, product_rows in columns.items():
+        os.makedirs(os.path.join(store_dir, product), exist_ok=True)
+        for column, values in zip(COLUMNS, product_rows):
+            dtype = np.int64 if column in ("day", "timestamp") else np.float64
+            np.save(os.path.join(store_dir, product, column + ".npy"), np.array(values, dtype=dtype))
+        manifest["products"][product] = len(product_rows[0])
+
+    # Written last so a half-finished conversion is never mistaken for a valid store
+    with open(os.path.join(store_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+    return store_dir
+
+
+class TickStore:
+    """Read-only view over a converted store. Arrays are np.memmap-backed, so every process
+    opening the same store shares the page cache instead of holding its own copy."""
+
+    def __init__(self, store_dir: str) -> None:
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self._cache: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @property
+    def products(self) -> List[str]:
+        return list(self.manifest["products"])
+
+    def product(self, product: str) -> Dict[str, np.ndarray]:
+        arrays = self._cache.get(product)
+        if arrays is None:
+            arrays = {
+                column: np.load(os.path.join(self.store_dir, product, column + ".npy"), mmap_mode="r")
+                for column in COLUMNS
+            }
+            self._cache[product] = arrays
+        return arrays
+
+    def column(self, product: str, column: str) -> np.ndarray:
+        return self.product(product)[column]
+
+    def missing(self, product: str, column: str) -> np.ndarray:
+        """Boolean mask of rows where ``column`` has no value (e.g. an absent book level)."""
+        return np.isnan(self.column(product, column))
+
+    def frame(self, product: str):
+        import pandas as pd
+
+        arrays = self.product(product)
+        df = pd.DataFrame({column: arrays[column] for column in COLUMNS}, copy=False)
+        df.insert(2, "product", product)
+        return df
+
+    def iter_snapshots(self, after: Optional[Tuple[int, int]] = None) -> Iterator[Snapshot]:
+        """Yield backtester Snapshots in (day, timestamp) order across all products, optionally
+        only those strictly after the (day, timestamp) ``after``."""
+        products = self.products
+        parts = [self.product(product) for product in products]
+        days = np.concatenate([part["day"] for part in parts])
+        timestamps = np.concatenate([part["timestamp"] for part in parts])
+        owner = np.concatenate([np.full(len(part["day"]), i) for i, part in enumerate(parts)])
+        rows = np.concatenate([np.arange(len(part["day"])) for part in parts])
+        order = np.lexsort((owner, timestamps, days))
+        if after is not None:
+            day, timestamp = after
+            sorted_days, sorted_timestamps = days[order], timestamps[order]
+            order = order[(sorted_days > day) | ((sorted_days == day) & (sorted_timestamps > timestamp))]
+
+        # Pull every column into plain Python lists once; per-row numpy scalar access is slow
+        lists = [{column: part[column].tolist() for column in COLUMNS} for part in parts]
+        levels = [list(zip(*(columns[column] for column in LEVEL_COLUMNS))) for columns in lists]
+        days = days[order].tolist()
+        timestamps = timestamps[order].tolist()
+        owner = owner[order].tolist()
+        rows = rows[order].tolist()
+
+        snapshot = None
+        for day, timestamp, i, row in zip(days, timestamps, owner, rows):
+            if snapshot is None or snapshot.timestamp != timestamp or snapshot.day != day:
+                if snapshot is not None:
+                    yield snapshot
+                snapshot = Snapshot(day, timestamp, {}, {})
+
+            product = products[i]
+            snapshot.order_depths[product] = order_depth_from_levels(levels[i][row])
+            mid_price = lists[i]["mid_price"][row]
+            if mid_price == mid_price:
+                snapshot.mid_prices[product] = mid_price
+
+        if snapshot is not None:
+            yield snapshot
+
+
+def open_store(csv_path: str, store_dir: Optional[str] = None) -> TickStore:
+    """Open the store for ``csv_path``, converting it first if missing or older than the CSV."""
+    store_dir = store_dir or default_store_dir(csv_path)
+    manifest_path = os.path.join(store_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") == VERSION and manifest.get("source_stamp") == source_stamp(csv_path):
+            return TickStore(store_dir)
+
+    return TickStore(convert(csv_path, store_dir))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a prices CSV into a memory-mappable columnar store.")
+    parser.add_argument("csv", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--out", help="store directory (default: <csv name>.ticks)")
+    args = parser.parse_args()
+
+    store = TickStore(convert(args.csv, args.out))
+    for product in store.products:
+        print(f"{product}: {store.manifest['products'][product]} rows")
@@ -0,0 +1,184 @@
+import base64
+import json
+import math
+import zlib
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Compact replacement for jsonpickle-encoded traderData.
+#
+# Output is "<schema>:<j|z>:<payload>" where the payload is JSON ("j") or zlib-compressed,
+# base64-encoded JSON ("z"). Inside the JSON, homogeneous numeric lists and ring buffers can be
+# packed into base64 machine arrays, tagged as single-key dicts:
+#   {"#d": "<b64 float64>"}, {"#q": "<b64 int64>"}, {"#r": [capacity, head, values]}
+# Keys of user dicts that start with "#" get one more "#" on encode, so they never look like tags.
+# Anything that does not match the header (e.g. old jsonpickle output of a plain dict) decodes
+# as schema 0 JSON, so existing traderData can be migrated forward.
+
+
+class RingBuffer:
+    """Fixed-capacity history that overwrites its oldest entry once full."""
+
+    def __init__(self, capacity: int, values: Optional[List[float]] = None, head: int = 0) -> None:
+        self.capacity = capacity
+        self.values: List[float] = values if values is not None else []
+        self.head = head
+
+    def append(self, value: float) -> None:
+        if len(self.values) < self.capacity:
+            self.values.append(value)
+        else:
+            self.values[self.head] = value
+            self.head = (self.head + 1) % self.capacity
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[float]:
+        # Oldest to newest
+        yield from self.values[self.head:]
+        yield from self.values[: self.head]
+
+    def __getitem__(self, i: int) -> float:
+        n = len(self.values)
+        if not -n <= i < n:
+            raise IndexError("RingBuffer index out of range")
+        return self.values[(self.head + i) % n]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RingBuffer) and self.capacity == other.capacity and list(self) == list(other)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _pack_list(values: List[Any]) -> Any:
+    # Only homogeneous lists are packed, so decoding gives back exactly the same types
+    if all(type(v) is float for v in values):
+        typecode = "d"
+    elif all(type(v) is int for v in values) and all(-(2 ** 63) <= v < 2 ** 63 for v in values):
+        typecode = "q"
+    else:
+        return None
+
+    # A packed value costs 32/3 base64 characters; short decimals such as 2028.5 are cheaper as
+    # text. Estimate the text size from a few evenly spaced samples rather than every element.
+    step = max(1, len(values) // 4)
+    samples = values[::step]
+    text_length = (sum(len(repr(v)) for v in samples) / len(samples) + 1) * len(values)
+    if text_length <= math.ceil(8 * len(values) / 3) * 4 + 8:
+        return None
+    return {"#" + typecode: _b64(array(typecode, values).tobytes())}
+
+
+class TraderDataCodec:
+
+    def __init__(self, schema: int = 1, migrations: Optional[Dict[int, Callable[[Any], Any]]] = None, compress_threshold: int = 512, pack_threshold: int = 8) -> None:
+        # migrations[n] turns a decoded schema-n object into a schema n + 1 object
+        self.schema = schema
+        self.migrations = migrations or {}
+        self.compress_threshold = compress_threshold
+        self.pack_threshold = pack_threshold
+
+    def encode(self, obj: Any) -> str:
+        payload = json.dumps(self._pack(obj), separators=(",", ":"))
+        if len(payload) >= self.compress_threshold:
+            compressed = _b64(zlib.compress(payload.encode("utf-8"), 1))
+            if len(compressed) < len(payload):
+                return f"{self.schema}:z:{compressed}"
+
+        return f"{self.schema}:j:{payload}"
+
+    def decode(self, data: Optional[str], default: Any = None) -> Any:
+        if not data:
+            return {} if default is None else default
+
+        schema, flag, payload = self._split(data)
+        if flag == "z":
+            payload = zlib.decompress(base64.b64decode(payload)).decode("utf-8")
+        obj = self._unpack(json.loads(payload))
+
+        while schema < self.schema:
+            migrate = self.migrations.get(schema)
+            if migrate is not None:
+                obj = migrate(obj)
+            schema += 1
+
+        return obj
+
+    def _split(self, data: str):
+        first = data.find(":")
+        if first > 0 and data[:first].isdigit() and data[first + 1 : first + 3] in ("j:", "z:"):
+            return int(data[:first]), data[first + 1], data[first + 3 :]
+        return 0, "j", data
+
+    def _pack(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return {("#" + key if isinstance(key, str) and key.startswith("#") else key): self._pack(value) for key, value in obj.items()}
+        if isinstance(obj, RingBuffer):
+            return {"#r": [obj.capacity, obj.head, self._pack(obj.values)]}
+        if isinstance(obj, array) and obj.typecode in ("d", "q"):
+            return {"#" + obj.typecode: _b64(obj.tobytes())}
+        if isinstance(obj, (list, tuple)):
+            if len(obj) >= self.pack_threshold:
+                packed = _pack_list(obj)
+                if packed is not None:
+                    return packed
+            return [self._pack(value) for value in obj]
+        return obj
+
+    def _unpack(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            if len(obj) == 1:
+                key = next(iter(obj))
+                if key in ("#d", "#q"):
+                    return array(key[1], base64.b64decode(obj[key])).tolist()
+                if key == "#r":
+                    capacity, head, values = obj[key]
+                    return RingBuffer(capacity, self._unpack(values), head)
+            return {(key[1:] if key.startswith("#") else key): self._unpack(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self._unpack(value) for value in obj]
+        return obj
+
+
+codec = TraderDataCodec()
+
+
+def benchmark(iterations: int = 2000) -> None:
+    import random
+    import timeit
+
+    import jsonpickle
+
+    from indicators import SMA
+
+    random.seed(0)
+    history = RingBuffer(500)
+    smas = {window: SMA(window) for window in (5, 10, 30, 100)}
+    for _ in range(1000):
+        mid = 2020 + random.gauss(0, 3)
+        history.append(mid)
+        for sma in smas.values():
+            sma.update(mid)
+
+    sample = {f"SMA{window}": sma.to_state() for window, sma in smas.items()}
+    sample["history"] = list(history)
+    sample["position"] = {"KELP": 12, "RAINFOREST_RESIN": -30}
+    with_ring = dict(sample, history=history)
+
+    cases = [
+        ("jsonpickle", lambda: jsonpickle.encode(sample), jsonpickle.decode),
+        ("codec", lambda: codec.encode(with_ring), codec.decode),
+    ]
+    print(f"{'format':<12}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    for name, encode, decode in cases:
+        encoded = encode()
+        encode_time = timeit.timeit(encode, number=iterations) / iterations * 1e6
+        decode_time = timeit.timeit(lambda: decode(encoded), number=iterations) / iterations * 1e6
+        print(f"{name:<12}{len(encoded):>8}{encode_time:>12.1f}{decode_time:>12.1f}")
+
+
+if __name__ == "__main__":
+    benchmark()
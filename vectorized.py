@@ -0,0 +1,179 @@
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backtester import Backtester, read_snapshots
+from fairpriceMean2 import ThresholdParams, Trader
+from tickstore import TickStore, open_store
+
+# fairpriceMean2's decision rule evaluated over a whole tick history at once.
+#
+# The rule compares best ask/bid against a threshold that depends on the current position.
+# Every (tick, threshold regime) comparison is done up front as one array operation; the only
+# sequential part is a scan that picks the regime from the running position, applies the
+# exchange's limit rejection and updates position and cash.
+
+
+def kelp_regime(position: int, band_small: int, band_large: int) -> int:
+    if band_small <= position <= band_large:
+        return 1
+    if position > band_large:
+        return 2
+    return 0
+
+
+def evaluate_product(product: str, arrays: Dict[str, np.ndarray], params: ThresholdParams) -> Dict[str, np.ndarray]:
+    """Signals, orders, positions and PnL for one product over every row of ``arrays``."""
+    base = params.acceptable_prices[product]
+    best_ask = np.asarray(arrays["ask_price_1"])
+    best_bid = np.asarray(arrays["bid_price_1"])
+
+    # Vectorized part: one comparison per regime. Regime 0 is the plain fair price; for KELP
+    # regimes 1 and 2 are the small and large position bands. NaN (missing level) compares False.
+    if product == "KELP":
+        buy_thresholds = np.array([base, base + params.kelp_small_buy_offset, base + params.kelp_large_buy_offset])
+        sell_thresholds = np.array([base, base + params.kelp_small_sell_offset, base + params.kelp_large_sell_offset])
+    else:
+        buy_thresholds = np.full(3, base)
+        sell_thresholds = np.full(3, base)
+    buy_ok = (best_ask[None, :] <= buy_thresholds[:, None]).tolist()
+    sell_ok = (best_bid[None, :] >= sell_thresholds[:, None]).tolist()
+
+    asks = np.nan_to_num(best_ask).astype(np.int64).tolist()
+    bids = np.nan_to_num(best_bid).astype(np.int64).tolist()
+    ask_volumes = np.nan_to_num(np.asarray(arrays["ask_volume_1"])).astype(np.int64).tolist()
+    bid_volumes = np.nan_to_num(np.asarray(arrays["bid_volume_1"])).astype(np.int64).tolist()
+    mids = np.asarray(arrays["mid_price"])
+    # Carry the last known mid forward like the backtester does
+    valid = ~np.isnan(mids)
+    mids = np.where(valid, mids, mids[np.maximum.accumulate(np.where(valid, np.arange(len(mids)), 0))]).tolist()
+    days = np.asarray(arrays["day"]).tolist()
+
+    n = len(asks)
+    # Filled as plain lists; element writes into numpy arrays are slower than the scan itself
+    position = [0] * n
+    buy_signal = [False] * n
+    sell_signal = [False] * n
+    buy_order = [0] * n
+    sell_order = [0] * n
+    buy_qty = [0] * n
+    sell_qty = [0] * n
+    rejected = [False] * n
+    pnl = [0.0] * n
+
+    limit = params.max_position
+    small, large = params.kelp_small_band, params.kelp_large_band
+    is_kelp = product == "KELP"
+    pos = 0
+    cash = 0.0
+    closed = 0.0
+    day = days[0] if n else None
+    for i in range(n):
+        if days[i] != day:
+            # New day: flat book, the previous day's marked PnL is banked
+            closed += cash + pos * mids[i - 1]
+            pos = 0
+            cash = 0.0
+            day = days[i]
+
+        position[i] = pos
+        buy_regime = kelp_regime(pos, small, large) if is_kelp else 0
+        sell_regime = kelp_regime(-pos, small, large) if is_kelp else 0
+        # Same sizing as the trader: buy the whole best ask level, sell up to capacity
+        buy_signal[i] = buy_ok[buy_regime][i]
+        sell_signal[i] = sell_ok[sell_regime][i]
+        buy = ask_volumes[i] if buy_signal[i] else 0
+        sell = min(bid_volumes[i], max(0, limit + pos)) if sell_signal[i] else 0
+        buy_order[i] = buy
+        sell_order[i] = sell
+
+        if pos + buy > limit or pos - sell < -limit:
+            rejected[i] = True
+        else:
+            buy_qty[i] = buy
+            sell_qty[i] = sell
+            pos += buy - sell
+            cash += sell * bids[i] - buy * asks[i]
+
+        pnl[i] = closed + cash + pos * mids[i]
+
+    return {
+        "buy_signal": np.array(buy_signal, dtype=bool),
+        "sell_signal": np.array(sell_signal, dtype=bool),
+        "buy_order": np.array(buy_order, dtype=np.int64),
+        "sell_order": np.array(sell_order, dtype=np.int64),
+        "buy_qty": np.array(buy_qty, dtype=np.int64),
+        "sell_qty": np.array(sell_qty, dtype=np.int64),
+        "rejected": np.array(rejected, dtype=bool),
+        "position": np.array(position, dtype=np.int64),
+        "pnl": np.array(pnl, dtype=np.float64),
+    }
+
+
+def evaluate(store: TickStore, params: Optional[ThresholdParams] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    params = params or ThresholdParams()
+    return {product: evaluate_product(product, store.product(product), params) for product in store.products}
+
+
+class _RecordingTrader:
+    """Wraps a Trader and keeps every order it submits, keyed by (timestamp, product)."""
+
+    def __init__(self, trader) -> None:
+        self.trader = trader
+        self.orders: Dict[tuple, List] = {}
+
+    def run(self, state):
+        result, conversions, trader_data = self.trader.run(state)
+        for product, orders in result.items():
+            self.orders[(state.timestamp, product)] = [(order.price, order.quantity) for order in orders]
+        return result, conversions, trader_data
+
+
+def check_consistency(csv_path: str, params: Optional[ThresholdParams] = None) -> List[str]:
+    """Compare vectorized orders and PnL with a per-tick replay of Trader.run. Returns a
+    description of every mismatch (empty when they agree)."""
+    params = params or ThresholdParams()
+    store = open_store(csv_path)
+    vectorized = evaluate(store, params)
+
+    recorder = _RecordingTrader(Trader(params))
+    replay = Backtester(recorder).run(read_snapshots(csv_path))
+
+    mismatches = []
+    for product, result in vectorized.items():
+        timestamps = store.column(product, "timestamp").tolist()
+        asks = store.column(product, "ask_price_1").tolist()
+        bids = store.column(product, "bid_price_1").tolist()
+        for i, timestamp in enumerate(timestamps):
+            expected = []
+            if result["buy_signal"][i]:
+                expected.append((asks[i], int(result["buy_order"][i])))
+            if result["sell_signal"][i]:
+                expected.append((bids[i], -int(result["sell_order"][i])))
+            submitted = recorder.orders.get((timestamp, product), [])
+            if submitted != expected:
+                mismatches.append(f"{product}@{timestamp}: run sent {submitted}, vectorized {expected}")
+
+        final = result["pnl"][-1] if len(result["pnl"]) else 0.0
+        if abs(final - replay.pnl.get(product, 0.0)) > 1e-6:
+            mismatches.append(f"{product}: final PnL run {replay.pnl.get(product, 0.0):.2f}, vectorized {final:.2f}")
+
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized evaluation of the fairpriceMean2 threshold strategy.")
+    parser.add_argument("prices", nargs="?", default="TutorialData.csv")
+    parser.add_argument("--check", action="store_true", help="verify against a per-tick Trader.run replay")
+    args = parser.parse_args()
+
+    results = evaluate(open_store(args.prices))
+    for product, result in results.items():
+        print(f"{product}: pnl={result['pnl'][-1]:.2f} buys={int((result['buy_qty'] > 0).sum())} sells={int((result['sell_qty'] > 0).sum())} rejected={int(result['rejected'].sum())}")
+
+    if args.check:
+        mismatches = check_consistency(args.prices)
+        for mismatch in mismatches[:20]:
+            print(mismatch)
+        print("consistent" if not mismatches else f"{len(mismatches)} mismatches")
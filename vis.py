@@ -1,74 +1,41 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from analytics import analyze
+from plotting import downsample
 
-# Read the CSV file using the semicolon as the delimiter
-df = pd.read_csv("TutorialData.csv", delimiter=";")
-
-# for product in df['product'].unique():
-#     # Filter rows where the 'product' column matches the current product
-#     product_df = df[df['product'] == product]
-
-#     # Select the 'mid_price' and calculate the spread
-#     product_midprice = product_df['mid_price']
-#     product_spread = product_df['ask_price_1'] - product_df['bid_price_1']
-#     product_df['SMA30']=product_df['mid_price'].rolling(window=30).mean()
-#     product_df.dropna(inplace=True)
-
-#     # Plot mid_price
-#     plt.figure()
-#     plt.plot(product_midprice)
-#     plt.plot(product_df['SMA30'])
-#     plt.title(f'Mid price of {product}')
-#     plt.xlabel('Time')
-#     plt.ylabel('Mid price')
-#     plt.show()
-
-#     print(f"Spread of {product}:")
-#     print(product_spread.describe())
-#     print(product_spread)
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
-
-# Read the CSV file with semicolon as the delimiter
-df = pd.read_csv("TutorialData.csv", delimiter=";")
-
-# Filter the DataFrame for the KELP product
-product = 'RAINFOREST_RESIN'
-product_df = df[df['product'] == product].copy()
-print(product_df['bid_price_1'].min())
-print(product_df['bid_price_1'].max())
-print(product_df['ask_price_1'].min())
-print(product_df['ask_price_1'].max())
 # Define moving average windows (e.g., 10 for short-term and 30 for long-term)
 short_window = 30
 long_window = 100
 
-# Compute the short-term and long-term moving averages using the midpoint price
-product_df['SMA_short'] = product_df['mid_price'].rolling(window=short_window).mean()
-product_df['SMA_long'] = product_df['mid_price'].rolling(window=long_window).mean()
-print(product_df['mid_price'].mean())
-# Drop rows with NaN values (from rolling calculations)
-plot_df = product_df.dropna(subset=['SMA_short', 'SMA_long'])
+# Statistics for every product in one pass; cached on disk, so re-runs are instant
+stats = analyze("TutorialData.csv", windows=(short_window, long_window))
 
-# Calculate the difference between the short and long moving averages
-plot_df['diff'] = plot_df['SMA_short'] - plot_df['SMA_long']
+for product, product_stats in stats.items():
+    # Spread distribution of each product
+    print(f"Spread of {product}:")
+    print(product_stats.summary['spread'])
+    print(product_stats.summary['spread_counts'])
 
-# Identify the indices where the moving averages cross
-# A crossover occurs when the sign of the difference changes
-crossover_indices = np.where(np.diff(np.sign(plot_df['diff'])) != 0)[0] + 1  # adjust index due to diff
-
-# Retrieve the time indices and corresponding prices for the crossover points
-crossover_times = plot_df.index[crossover_indices]
-crossover_prices = plot_df['mid_price'].iloc[crossover_indices]
+product = 'RAINFOREST_RESIN'
+product_stats = stats[product]
+print(product_stats.summary['bid_price_1']['min'])
+print(product_stats.summary['bid_price_1']['max'])
+print(product_stats.summary['ask_price_1']['min'])
+print(product_stats.summary['ask_price_1']['max'])
+print(product_stats.summary['mid_price']['mean'])
+
+# Rows where the short and long moving averages cross
+crossover_indices = product_stats.crossovers(short_window, long_window)
+mid_price = product_stats['mid_price']
+index = np.arange(len(mid_price))
 
 # Plot the midpoint price and both moving averages
+# (downsampled to ~2 points per pixel of the 1200px-wide figure)
 plt.figure(figsize=(12, 6))
-plt.plot(product_df.index, product_df['mid_price'], label="Mid Price", color='black')
-plt.plot(product_df.index, product_df['SMA_short'], label=f"SMA{short_window}", color='blue')
-plt.plot(product_df.index, product_df['SMA_long'], label=f"SMA{long_window}", color='red')
-plt.scatter(crossover_times, crossover_prices, label="Crossover", color='green', marker='o', s=100)
+plt.plot(*downsample(index, mid_price, 1200), label="Mid Price", color='black')
+plt.plot(*downsample(index, product_stats[f'sma_{short_window}'], 1200), label=f"SMA{short_window}", color='blue')
+plt.plot(*downsample(index, product_stats[f'sma_{long_window}'], 1200), label=f"SMA{long_window}", color='red')
+plt.scatter(crossover_indices, mid_price[crossover_indices], label="Crossover", color='green', marker='o', s=100)
 plt.title(f'Moving Average Crossover for {product}')
 plt.xlabel('Time')
 plt.ylabel('Price')